@@ -0,0 +1,281 @@
+"""
+新闻归档模块
+把每次抓取到的新闻 (标题、摘要、链接、来源、发布时间) 存入本地SQLite，
+用FTS5建立全文索引；新条目按批增量写入，不需要重建索引
+
+用法:
+    python archive.py search "BMW battery" --days 30
+    python archive.py search "tariff*" --source Autocar --limit 50
+    python archive.py stats
+"""
+
+import argparse
+import calendar
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from config import ARCHIVE
+from seen_index import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# 检索词: 普通词或带 * 的前缀词，其余字符 (FTS5语法符号) 都当作分隔符
+_TERM_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    link TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    published INTEGER,
+    ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_ts ON articles (ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, summary,
+    content='articles', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+    VALUES ('delete', old.id, old.title, old.summary);
+END;
+"""
+
+
+def _epoch(dt: Optional[datetime]) -> Optional[int]:
+    """datetime转时间戳，不带时区的按UTC处理"""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return calendar.timegm(dt.timetuple())
+    return int(dt.timestamp())
+
+
+def build_match_query(text: str) -> str:
+    """把 "BMW battery" 这样的检索词转成FTS5查询 (所有词都需出现，支持 batt* 前缀)"""
+    terms = []
+    for term in _TERM_RE.findall(text):
+        if term.endswith("*"):
+            terms.append(f'"{term[:-1]}"*')
+        else:
+            terms.append(f'"{term}"')
+    return " ".join(terms)
+
+
+class NewsArchive:
+    """新闻归档 - 按规范化URL去重，只新增不覆盖"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 抓取线程并发写入，连接共享并由锁保护
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def add_many(self, news_list: Iterable[Dict]) -> int:
+        """批量写入 (一个事务)，已存在的链接跳过，返回新增条数"""
+        now = int(time.time())
+        rows = []
+        for news in news_list:
+            link = news.get("link", "")
+            url_key = normalize_url(link)
+            if not url_key or not news.get("title"):
+                continue
+            published = _epoch(news.get("published"))
+            rows.append((
+                url_key, link, news["title"], news.get("summary", ""), news.get("source", ""),
+                published, published if published is not None else now,
+            ))
+        if not rows:
+            return 0
+
+        with self._lock:
+            last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (url_key, link, title, summary, source, published, ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.commit()
+            return self.conn.execute("SELECT COUNT(*) FROM articles WHERE id > ?", (last_id,)).fetchone()[0]
+
+    def search(self, text: str, days: Optional[float] = None, source: Optional[str] = None,
+               limit: int = 20) -> List[Dict]:
+        """
+        全文检索，按相关度 (bm25, 标题权重更高) 排序
+        days: 只查最近N天；source: 只查某个来源
+        """
+        query = build_match_query(text)
+        if not query:
+            return []
+
+        sql = [
+            "SELECT a.title, a.link, a.summary, a.source, a.published, a.ts,",
+            "       snippet(articles_fts, 1, '[', ']', '…', 16),",
+            "       bm25(articles_fts, 3.0, 1.0) AS rank",
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid",
+            "WHERE articles_fts MATCH ?",
+        ]
+        params = [query]
+        if days is not None:
+            sql.append("AND a.ts >= ?")
+            params.append(int(time.time() - days * 86400))
+        if source:
+            sql.append("AND a.source = ?")
+            params.append(source)
+        sql.append("ORDER BY rank, a.ts DESC LIMIT ?")
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute("\n".join(sql), params).fetchall()
+
+        return [
+            {
+                "title": title,
+                "link": link,
+                "summary": summary,
+                "source": src,
+                "published": datetime.fromtimestamp(published, timezone.utc) if published is not None else None,
+                "timestamp": ts,
+                "snippet": snippet,
+                "rank": rank,
+            }
+            for title, link, summary, src, published, ts, snippet, rank in rows
+        ]
+
+    def items_between(self, start: float, end: float) -> List[Dict]:
+        """时间范围 [start, end) 内的全部条目，按时间倒序"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT title, link, summary, source, published FROM articles "
+                "WHERE ts >= ? AND ts < ? ORDER BY ts DESC",
+                (int(start), int(end))
+            ).fetchall()
+        return [
+            {
+                "title": title,
+                "link": link,
+                "summary": summary,
+                "source": source,
+                "published": datetime.fromtimestamp(published, timezone.utc) if published is not None else None,
+            }
+            for title, link, summary, source, published in rows
+        ]
+
+    def stats(self) -> Dict:
+        """条目数和时间范围"""
+        with self._lock:
+            count, first, last = self.conn.execute("SELECT COUNT(*), MIN(ts), MAX(ts) FROM articles").fetchone()
+            sources = self.conn.execute(
+                "SELECT source, COUNT(*) FROM articles GROUP BY source ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return {
+            "count": count,
+            "first": datetime.fromtimestamp(first, timezone.utc).isoformat() if first else None,
+            "last": datetime.fromtimestamp(last, timezone.utc).isoformat() if last else None,
+            "sources": dict(sources),
+        }
+
+    def optimize(self):
+        """合并FTS索引段 (大量写入后可偶尔执行)"""
+        with self._lock:
+            self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[NewsArchive]:
+    """获取共享的归档实例，未启用时返回None"""
+    global _archive
+    if not ARCHIVE.get("enabled"):
+        return None
+
+    with _archive_lock:
+        if _archive is None:
+            try:
+                _archive = NewsArchive(ARCHIVE["path"])
+            except sqlite3.Error as e:
+                logger.error(f"打开新闻归档失败: {str(e)}")
+                return None
+        return _archive
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="检索新闻归档")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    search = sub.add_parser("search", help="全文检索")
+    search.add_argument("query", help='检索词，如 "BMW battery"，支持 batt* 前缀匹配')
+    search.add_argument("--days", type=float, help="只查最近N天")
+    search.add_argument("--source", help="只查某个来源")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--json", action="store_true", help="输出JSON")
+
+    sub.add_parser("stats", help="归档统计")
+    sub.add_parser("optimize", help="合并全文索引")
+
+    args = parser.parse_args(argv)
+    archive = NewsArchive(ARCHIVE["path"])
+
+    if args.command == "stats":
+        print(json.dumps(archive.stats(), ensure_ascii=False, indent=2))
+        return 0
+    if args.command == "optimize":
+        archive.optimize()
+        return 0
+
+    start = time.perf_counter()
+    results = archive.search(args.query, days=args.days, source=args.source, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        for r in results:
+            r["published"] = r["published"].isoformat() if r["published"] else None
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    for i, r in enumerate(results, 1):
+        published = r["published"].strftime("%Y-%m-%d") if r["published"] else "未知"
+        print(f"{i}. {r['title']}")
+        print(f"   {r['source']} | {published} | {r['link']}")
+        print(f"   {r['snippet']}")
+    print(f"\n共 {len(results)} 条，用时 {elapsed:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
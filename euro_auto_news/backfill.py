@@ -0,0 +1,259 @@
+"""
+历史回放模块
+从新闻归档 (archive.py) 中取出每天早报时刻之前一个时间窗内的新闻，
+按当前的去重、关键词过滤和排序配置重新生成当天的早报，写入文件而不推送；
+修改 FILTER_KEYWORDS 或排序参数后，可以重建历史早报并与改动前的结果对比。
+各天互相独立，用多进程并行处理
+
+回放不考虑当时的已推送记录 (SEEN_INDEX)，每天的候选只取决于归档中的发布时间
+
+用法:
+    python backfill.py run --start 2026-09-01 --end 2026-10-17 --out /tmp/digests_old
+    python backfill.py run --start 2026-09-01 --end 2026-10-17 --out /tmp/digests_new --formats markdown,feishu_cards
+    python backfill.py diff /tmp/digests_old /tmp/digests_new
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+from archive import NewsArchive
+from config import ARCHIVE, DAILY_HOUR, DAILY_MINUTE, MAX_NEWS_COUNT, RSS_SOURCES, STATE_DIR
+from dates import LOCAL_TZ
+from fetcher import NewsSelector
+from metrics import RunMetrics
+from models import NewsItem, set_reference_time
+from processor import process_news, serialize_card
+
+logger = logging.getLogger(__name__)
+
+# 输出格式 -> 文件扩展名
+FORMAT_EXTENSIONS = {
+    "markdown": "md",
+    "html": "html",
+    "feishu_cards": "json",
+}
+
+INDEX_FILE = "index.json"
+
+# 工作进程内打开的归档 (每个进程一个连接)
+_worker_archive = None
+
+
+def _init_worker(archive_path: str):
+    global _worker_archive
+    _worker_archive = NewsArchive(archive_path)
+
+
+def digest_time(day: date) -> datetime:
+    """某天早报的生成时刻 (定时任务时区)"""
+    return datetime(day.year, day.month, day.day, DAILY_HOUR, DAILY_MINUTE, tzinfo=LOCAL_TZ)
+
+
+def _source_order() -> Dict[str, int]:
+    return {source["name"]: i for i, source in enumerate(RSS_SOURCES)}
+
+
+def replay_day(day: date, out_dir: str, formats: List[str], window_hours: float,
+               archive: Optional[NewsArchive] = None) -> Dict:
+    """
+    回放一天: 取出时间窗内的归档条目，去重、过滤、排序后生成早报并写入 out_dir
+    返回当天的概况 (候选数、入选条目和各环节丢弃数)
+    """
+    archive = archive or _worker_archive
+    now = digest_time(day)
+    start = time.perf_counter()
+
+    rows = archive.items_between((now - timedelta(hours=window_hours)).timestamp(), now.timestamp())
+    # 与实时抓取一致: 按配置中的源顺序输出，同一源内新的在前 (近似去重时先到的条目保留)
+    order = _source_order()
+    rows.sort(key=lambda row: order.get(row["source"], len(order)))
+    candidates = [NewsItem.from_dict(row) for row in rows]
+
+    # 相对日期和时效打分都以当天的早报时刻为准
+    set_reference_time(now)
+    metrics = RunMetrics()
+    selected = NewsSelector(metrics, now=now).select(candidates, MAX_NEWS_COUNT)
+    processed = process_news(selected, metrics, date=now)
+
+    name = day.isoformat()
+    for fmt in formats:
+        rendered = processed.render(fmt)
+        path = os.path.join(out_dir, f"{name}.{FORMAT_EXTENSIONS[fmt]}")
+        if fmt == "feishu_cards":
+            with open(path, "wb") as f:
+                f.write(b"[" + b",".join(serialize_card(card) for card in rendered) + b"]")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(rendered)
+
+    return {
+        "date": name,
+        "candidates": len(candidates),
+        "selected": [
+            {"title": news["title"], "link": news["link"], "source": news["source"], "score": news.get("score")}
+            for news in selected
+        ],
+        "dropped": dict(metrics.dropped),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def _replay_in_worker(day: date, out_dir: str, formats: List[str], window_hours: float) -> Dict:
+    return replay_day(day, out_dir, formats, window_hours)
+
+
+def backfill(start: date, end: date, out_dir: str, formats: Optional[List[str]] = None,
+             window_hours: float = 24, processes: Optional[int] = None,
+             archive_path: Optional[str] = None) -> Dict:
+    """
+    回放 [start, end] 内的每一天 (含两端)，结果写入 out_dir，概况写入 out_dir/index.json
+    processes: 并行进程数，默认为CPU核数；为1时在本进程中依次处理
+    """
+    formats = formats or ["markdown"]
+    unknown = [fmt for fmt in formats if fmt not in FORMAT_EXTENSIONS]
+    if unknown:
+        raise ValueError(f"不支持的输出格式: {', '.join(unknown)}")
+    if end < start:
+        raise ValueError("结束日期早于开始日期")
+
+    archive_path = archive_path or ARCHIVE["path"]
+    if not os.path.exists(archive_path):
+        raise FileNotFoundError(f"新闻归档不存在: {archive_path}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    processes = max(1, min(processes or os.cpu_count() or 1, len(days)))
+
+    started = time.perf_counter()
+    if processes == 1:
+        archive = NewsArchive(archive_path)
+        try:
+            results = [replay_day(day, out_dir, formats, window_hours, archive) for day in days]
+        finally:
+            archive.close()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(archive_path,)
+        ) as executor:
+            results = list(executor.map(
+                _replay_in_worker, days,
+                [out_dir] * len(days), [formats] * len(days), [window_hours] * len(days)
+            ))
+    elapsed = time.perf_counter() - started
+
+    index = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "window_hours": window_hours,
+        "formats": formats,
+        "seconds": round(elapsed, 2),
+        "days": results,
+    }
+    with open(os.path.join(out_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"回放完成: {len(days)} 天，{processes} 个进程，用时 {elapsed:.1f}秒 -> {out_dir}")
+    return index
+
+
+def compare(dir_a: str, dir_b: str) -> Dict:
+    """
+    对比两次回放的入选条目 (按链接)
+    返回每天新增/移除的条目和整体重合率
+    """
+    def load(directory):
+        with open(os.path.join(directory, INDEX_FILE), encoding="utf-8") as f:
+            return {day["date"]: day["selected"] for day in json.load(f)["days"]}
+
+    days_a, days_b = load(dir_a), load(dir_b)
+    result = {"days": [], "overlap": 0, "total": 0}
+    for name in sorted(set(days_a) & set(days_b)):
+        links_a = {news["link"]: news for news in days_a[name]}
+        links_b = {news["link"]: news for news in days_b[name]}
+        common = links_a.keys() & links_b.keys()
+        result["overlap"] += len(common)
+        result["total"] += len(links_a.keys() | links_b.keys())
+        if links_a.keys() != links_b.keys():
+            result["days"].append({
+                "date": name,
+                "removed": [links_a[link]["title"] for link in links_a if link not in common],
+                "added": [links_b[link]["title"] for link in links_b if link not in common],
+            })
+    return result
+
+
+def _parse_day(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="按当前配置回放历史早报")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="回放日期范围内的早报")
+    run.add_argument("--start", type=_parse_day, required=True, help="开始日期 YYYY-MM-DD")
+    run.add_argument("--end", type=_parse_day, help="结束日期 (含)，默认为昨天")
+    run.add_argument("--out", default=os.path.join(STATE_DIR, "backfill"), help="输出目录 (默认: 状态目录下的 backfill)")
+    run.add_argument("--formats", default="markdown",
+                     help=f"输出格式，逗号分隔: {', '.join(FORMAT_EXTENSIONS)} (默认: markdown)")
+    run.add_argument("--window-hours", type=float, default=24, help="每天早报的候选时间窗 (小时，默认24)")
+    run.add_argument("--processes", type=int, help="并行进程数 (默认: CPU核数)")
+    run.add_argument("--archive", help="归档路径 (默认: config.ARCHIVE)")
+
+    diff = sub.add_parser("diff", help="对比两次回放的入选条目")
+    diff.add_argument("dir_a")
+    diff.add_argument("dir_b")
+    diff.add_argument("--json", action="store_true", help="输出JSON")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == "run":
+        end = args.end or datetime.now(LOCAL_TZ).date() - timedelta(days=1)
+        try:
+            index = backfill(
+                args.start, end, args.out,
+                formats=[fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+                window_hours=args.window_hours,
+                processes=args.processes,
+                archive_path=args.archive
+            )
+        except (ValueError, FileNotFoundError) as e:
+            logger.error(str(e))
+            return 1
+        selected = sum(len(day["selected"]) for day in index["days"])
+        print(f"{len(index['days'])} 天，共入选 {selected} 条，用时 {index['seconds']}秒，输出目录: {args.out}")
+        return 0
+
+    result = compare(args.dir_a, args.dir_b)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    for day in result["days"]:
+        print(f"{day['date']}:")
+        for title in day["removed"]:
+            print(f"   - {title}")
+        for title in day["added"]:
+            print(f"   + {title}")
+    ratio = result["overlap"] / result["total"] if result["total"] else 1.0
+    print(f"\n{len(result['days'])} 天有差异，入选条目重合率 {ratio:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+clean_html 微基准
+对比旧实现 (每条两次未编译的正则替换 + 截断) 与 html_text.html_to_text
+在样例RSS内容 (fixtures目录) 上的耗时
+
+用法: python benchmarks/bench_clean_html.py [-n 重复次数]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from html_text import html_to_text  # noqa: E402
+
+SUMMARY_MAX_CHARS = 500
+
+# 样例中包含HTML内容的字段
+PAYLOAD_TAGS = (
+    "description",
+    "{http://purl.org/rss/1.0/modules/content/}encoded",
+    "{http://www.w3.org/2005/Atom}summary",
+    "{http://www.w3.org/2005/Atom}content",
+)
+
+
+def legacy_clean_html(html_text: str) -> str:
+    """旧实现 - 与改动前的 NewsFetcher.clean_html 相同"""
+    if not html_text:
+        return ""
+
+    import re
+    text = re.sub(r'<[^>]+>', '', html_text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def load_payloads() -> list:
+    """从样例feed中取出原始HTML内容"""
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*"))):
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError:
+            continue
+        for tag in PAYLOAD_TAGS:
+            payloads.extend(el.text for el in root.iter(tag) if el.text)
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_html 微基准")
+    parser.add_argument("-n", "--number", type=int, default=20, help="重复次数")
+    args = parser.parse_args()
+
+    payloads = load_payloads()
+    if not payloads:
+        print(f"未找到样例内容: {FIXTURE_DIR}")
+        return 1
+
+    total_kb = sum(len(p) for p in payloads) / 1024
+    print(f"样例: {len(payloads)} 段HTML, 共 {total_kb:.1f} KB, 重复 {args.number} 次\n")
+
+    cases = [
+        ("旧实现 (全文+截断)", lambda: [legacy_clean_html(p)[:SUMMARY_MAX_CHARS] for p in payloads]),
+        ("html_to_text (全文)", lambda: [html_to_text(p) for p in payloads]),
+        (f"html_to_text (上限{SUMMARY_MAX_CHARS})", lambda: [html_to_text(p, SUMMARY_MAX_CHARS) for p in payloads]),
+    ]
+
+    baseline = None
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3)) / args.number
+        per_item = seconds / len(payloads) * 1e6
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds * 1000:8.2f} ms/轮  {per_item:7.1f} µs/条  x{baseline / seconds:.2f}")
+
+    # 旧实现未解码的实体数量
+    leaked = sum(len(re.findall(r"&#?\w+;", legacy_clean_html(p))) for p in payloads)
+    print(f"\n旧实现结果中残留的HTML实体: {leaked} 处")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+feed解析器对比
+在样例feed (fixtures目录) 上逐条比较 fast_feed 快速路径与feedparser的结果
+(标题、链接、清洗后的摘要、发布时间、源的更新间隔提示)，再对比两者的解析耗时
+
+用法: python benchmarks/bench_parser.py [-n 重复次数] [--scale 条目放大倍数]
+有不一致的条目时返回非0
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import feedparser  # noqa: E402
+
+from dates import entry_datetime, install_feedparser_handler  # noqa: E402
+from fast_feed import parse_fast  # noqa: E402
+from fetcher import SUMMARY_MAX_CHARS  # noqa: E402
+from html_text import html_to_text  # noqa: E402
+from source_scheduler import feed_hint  # noqa: E402
+
+_ITEMS_RE = re.compile(rb"(<item>.*</item>|<entry>.*</entry>)", re.DOTALL)
+
+
+def load_feeds(scale: int) -> list:
+    """读取样例feed，scale>1时把条目重复多次得到更大的feed"""
+    feeds = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*"))):
+        with open(path, "rb") as f:
+            content = f.read()
+        if scale > 1:
+            content = _ITEMS_RE.sub(lambda m: m.group(1) * scale, content, count=1)
+        feeds.append((os.path.basename(path), content))
+    return feeds
+
+
+def entry_fields(entry) -> tuple:
+    """与 NewsFetcher.parse_entry 使用的字段一致"""
+    return (
+        entry.get("title", "").strip(),
+        entry.get("link", "").strip(),
+        html_to_text(entry.get("summary", ""), SUMMARY_MAX_CHARS),
+        entry_datetime(entry),
+    )
+
+
+def compare(name: str, content: bytes) -> int:
+    """逐条比较两种解析结果，返回不一致的数量"""
+    expected = feedparser.parse(content)
+    actual = parse_fast(content)
+
+    mismatches = 0
+    if len(expected.entries) != len(actual.entries):
+        print(f"  {name}: 条目数不一致 feedparser={len(expected.entries)} fast={len(actual.entries)}")
+        mismatches += 1
+    if feed_hint(expected.feed) != feed_hint(actual.feed):
+        print(f"  {name}: 更新间隔提示不一致 {feed_hint(expected.feed)} != {feed_hint(actual.feed)}")
+        mismatches += 1
+    for i, (a, b) in enumerate(zip(expected.entries, actual.entries)):
+        for field, x, y in zip(("title", "link", "summary", "published"), entry_fields(a), entry_fields(b)):
+            if x != y:
+                print(f"  {name} #{i} {field}: {x!r} != {y!r}")
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="feed解析器对比")
+    parser.add_argument("-n", "--number", type=int, default=10, help="重复次数")
+    parser.add_argument("--scale", type=int, default=1, help="每个feed的条目放大倍数")
+    args = parser.parse_args()
+
+    install_feedparser_handler()
+    feeds = load_feeds(args.scale)
+    if not feeds:
+        print(f"未找到样例feed: {FIXTURE_DIR}")
+        return 1
+
+    print("结果校验:")
+    mismatches = sum(compare(name, content) for name, content in feeds)
+    print(f"  {'全部一致' if not mismatches else f'{mismatches} 处不一致'}\n")
+
+    print(f"解析耗时 (重复 {args.number} 次):")
+    for name, content in feeds:
+        entries = len(parse_fast(content).entries)
+        timings = []
+        for func in (feedparser.parse, parse_fast):
+            seconds = min(timeit.repeat(lambda: func(content), number=args.number, repeat=3)) / args.number
+            timings.append(seconds)
+        slow, fast = timings
+        print(f"  {name:<28} {len(content) / 1024:7.1f} KB {entries:5d} 条  "
+              f"feedparser {slow * 1000:8.2f} ms  fast {fast * 1000:7.2f} ms  x{slow / fast:.1f}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+全流程基准
+在本地HTTP服务上回放 fixtures 中的样例feed，依次运行
+fetch_news -> process_news -> send_notification，
+飞书Webhook由同一本地服务模拟，SMTP替换为内存实现，不会产生任何外部请求
+
+输出每个阶段的耗时、内存峰值和吞吐 (条/秒)，源数量和feed大小可以按需放大
+
+用法:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --feeds 6,100,500 --feed-size 1,4 --json report.json
+    python benchmarks/bench_pipeline.py --feeds 500 --parse-processes auto
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+# 状态目录指向临时目录，不影响正式运行的缓存和索引
+# (解析进程池的子进程也会导入本模块，只在主进程中创建)
+if __name__ == "__main__":
+    os.environ["EURO_NEWS_STATE_DIR"] = tempfile.mkdtemp(prefix="euro_news_bench_")
+
+import config  # noqa: E402
+import notifier  # noqa: E402
+import smtp_pool  # noqa: E402
+from fetcher import fetch_news  # noqa: E402
+from processor import process_news  # noqa: E402
+from notifier import send_notification  # noqa: E402
+
+_ITEM_RE = re.compile(r"<item>.*?</item>|<entry>.*?</entry>", re.DOTALL)
+_LINK_RE = re.compile(r"(<link>|<link [^>]*href=\")(https?://[^<\"]+)")
+
+
+def load_fixtures() -> list:
+    """读取样例feed，拆成 (头部, 条目列表, 尾部)"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        items = _ITEM_RE.findall(text)
+        if not items:
+            continue
+        head = text[:text.index(items[0])]
+        tail = text[text.rindex(items[-1]) + len(items[-1]):]
+        fixtures.append((head, items, tail))
+    return fixtures
+
+
+def build_feed(fixture: tuple, feed_index: int, size: int) -> bytes:
+    """
+    由样例生成第 feed_index 个源的内容
+    size为条目倍数；链接带上源编号和副本编号，标题保持不变 (模拟转载)
+    """
+    head, items, tail = fixture
+    body = []
+    for copy in range(size):
+        for item in items:
+            body.append(_LINK_RE.sub(
+                lambda m: f"{m.group(1)}{m.group(2).split('?')[0]}-f{feed_index}c{copy}",
+                item
+            ))
+    return (head + "".join(body) + tail).encode("utf-8")
+
+
+class BenchServer:
+    """本地HTTP服务 - GET /feeds/<n>.xml 返回样例feed，POST /webhook 模拟飞书"""
+
+    def __init__(self):
+        self.feeds = {}
+        self.webhook_calls = 0
+        self.bytes_served = 0
+        bench = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = bench.feeds.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                bench.bytes_served += len(body)
+                self._reply(200, body, "application/rss+xml; charset=utf-8")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                bench.webhook_calls += 1
+                self._reply(200, b'{"code": 0, "msg": "success"}', "application/json")
+
+            def _reply(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def publish(self, fixtures: list, feed_count: int, size: int) -> list:
+        """生成 feed_count 个源，返回对应的 RSS_SOURCES 配置"""
+        self.feeds = {}
+        sources = []
+        for i in range(feed_count):
+            path = f"/feeds/{i}.xml"
+            self.feeds[path] = build_feed(fixtures[i % len(fixtures)], i, size)
+            sources.append({"name": f"Bench Feed {i}", "url": self.base_url + path, "enabled": True})
+        return sources
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+class FakeSMTP:
+    """内存SMTP - 记录发送的邮件"""
+
+    sent = []
+
+    def __init__(self, host=None, port=None, *args, **kwargs):
+        pass
+
+    def starttls(self, *args, **kwargs):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        FakeSMTP.sent.append(len(msg))
+
+    def noop(self):
+        return 250, b"OK"
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def configure(server: BenchServer):
+    """把配置指向本地服务和内存SMTP"""
+    # 所有源都在同一个本地主机上，关闭按主机的请求间隔
+    config.FETCH_CONFIG["host_interval"] = 0
+    config.FETCH_CONFIG["per_host_limit"] = config.FETCH_CONFIG.get("max_workers", 8)
+    # 每轮都测冷启动的完整路径
+    config.FEED_CACHE["enabled"] = False
+    config.SEEN_INDEX["enabled"] = False
+
+    notifier.FEISHU_WEBHOOK = server.base_url + "/webhook"
+    smtp_pool.smtplib.SMTP = FakeSMTP
+    config.EMAIL_CONFIG.update({"enabled": True, "to_emails": ["bench@example.com"]})
+
+
+def run_stages(trace: bool) -> dict:
+    """运行一次完整流程，返回各阶段耗时 (和内存峰值)"""
+    stages = {}
+
+    def measure(name, func, *args):
+        if trace:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = func(*args)
+        stages[name] = {"seconds": time.perf_counter() - start}
+        if trace:
+            stages[name]["peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+        return result
+
+    def process(news_list):
+        # process_news 只做准备，各格式在首次使用时才生成；这里把已启用渠道的格式都生成出来计入处理阶段
+        processed = process_news(news_list)
+        processed.prepare(notifier.Notifier().required_formats())
+        return processed
+
+    news_list = measure("fetch", fetch_news)
+    processed = measure("process", process, news_list)
+    measure("send", send_notification, processed)
+    stages["news_count"] = len(news_list)
+    return stages
+
+
+def run_case(server: BenchServer, fixtures: list, feed_count: int, size: int) -> dict:
+    """测一组规模: 先计时，再单独跑一遍统计内存 (tracemalloc会拖慢计时)"""
+    config.RSS_SOURCES[:] = server.publish(fixtures, feed_count, size)
+    total_items = sum(len(fixtures[i % len(fixtures)][1]) * size for i in range(feed_count))
+
+    server.bytes_served = 0
+    timing = run_stages(trace=False)
+    bytes_served = server.bytes_served
+
+    tracemalloc.start()
+    try:
+        memory = run_stages(trace=True)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "feeds": feed_count,
+        "feed_size": size,
+        "items": total_items,
+        "bytes": bytes_served,
+        "news_count": timing["news_count"],
+        "stages": {
+            name: {
+                "seconds": timing[name]["seconds"],
+                "peak_kb": memory[name]["peak_kb"],
+            }
+            for name in ("fetch", "process", "send")
+        },
+        "items_per_sec": total_items / timing["fetch"]["seconds"] if timing["fetch"]["seconds"] else 0.0,
+    }
+
+
+def print_report(results: list):
+    header = (f"{'源数':>5} {'倍数':>4} {'条目':>7} {'下载MB':>7} | "
+              f"{'抓取s':>7} {'处理s':>7} {'推送s':>7} | "
+              f"{'抓取峰值MB':>10} {'处理峰值MB':>10} | {'条/秒':>9}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        s = r["stages"]
+        print(f"{r['feeds']:>5} {r['feed_size']:>4} {r['items']:>7} {r['bytes'] / 1048576:>7.2f} | "
+              f"{s['fetch']['seconds']:>7.3f} {s['process']['seconds']:>7.3f} {s['send']['seconds']:>7.3f} | "
+              f"{s['fetch']['peak_kb'] / 1024:>10.2f} {s['process']['peak_kb'] / 1024:>10.2f} | "
+              f"{r['items_per_sec']:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="全流程基准")
+    parser.add_argument("--feeds", default="6,50,100,500", help="源数量列表，逗号分隔")
+    parser.add_argument("--feed-size", default="1", help="每个源的条目倍数列表，逗号分隔")
+    parser.add_argument("--json", help="把结果写入JSON文件")
+    parser.add_argument("--parse-processes", default="0",
+                        help='解析进程数 (FETCH_CONFIG["parse_processes"])，0为不启用，auto为CPU核数')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        print(f"未找到样例feed: {FIXTURE_DIR}")
+        return 1
+
+    server = BenchServer()
+    configure(server)
+    config.FETCH_CONFIG["parse_processes"] = args.parse_processes if args.parse_processes == "auto" \
+        else int(args.parse_processes)
+    config.FETCH_CONFIG["parse_min_bytes"] = 0
+
+    results = []
+    try:
+        for size in [int(x) for x in args.feed_size.split(",")]:
+            for feed_count in [int(x) for x in args.feeds.split(",")]:
+                results.append(run_case(server, fixtures, feed_count, size))
+    finally:
+        server.close()
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
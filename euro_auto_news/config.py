@@ -44,7 +44,7 @@ FILTER_KEYWORDS = [
     "Europe", "European", "Germany", "German",
     "Volkswagen", "BMW", "Mercedes", "Audi", "Porsche",
     "VW", "Daimler", "Opel", "Peugeot", "Renault",
-    "Tesla", "electric", "EV", "battery", "charging",
+    "Tesla", "electric", "electrified", "electrification", "EV", "battery", "charging",
     "sales", "market", "launch", "new model",
     "OEM", "automaker", "car industry"
 ]
@@ -58,6 +58,52 @@ EXCLUDE_KEYWORDS = [
 # 新闻数量限制
 MAX_NEWS_COUNT = 15
 
+# 相似新闻合并 - 不同媒体转载的同一条新闻只保留一条，并注明其他来源
+DEDUP_CONFIG = {
+    "near_duplicate": True,
+    "threshold": 0.5,        # 判定为同一新闻的相似度阈值 (Jaccard)
+    "num_perm": 64,          # MinHash签名长度
+    "bands": 16,             # LSH分桶数 (num_perm需能被整除)
+    "shingle_size": 2,       # 按词切片的长度
+    "summary_chars": 200,    # 参与比较的摘要长度
+}
+
+# 排序打分 - 综合关键词命中、来源优先级、时效和转载数，取分数最高的 MAX_NEWS_COUNT 条
+# 来源优先级在 RSS_SOURCES 中用 "priority" 指定，默认为1
+RANKING_CONFIG = {
+    "enabled": True,         # 关闭时退回按发布时间取最新的条目
+    "keyword_weight": 1.0,   # 关键词命中: log(1 + 命中关键词的权重之和)
+    "source_weight": 1.0,    # 来源优先级
+    "recency_weight": 2.0,   # 时效: 刚发布为1，按半衰期指数衰减
+    "cluster_weight": 1.0,   # 转载数: log(报道同一新闻的媒体数)
+    "half_life_hours": 12,
+    "keyword_weights": {     # 关键词权重 (与 FILTER_KEYWORDS 中的写法一致)，未列出的为1
+        # "EV": 2.0,
+    },
+}
+
+# ==================== 抓取配置 ====================
+FETCH_CONFIG = {
+    "max_workers": 8,        # 并发抓取线程数
+    "per_host_limit": 2,     # 同一主机的最大并发请求数
+    "host_interval": 1.0,    # 同一主机两次请求的最小间隔(秒)
+    "parse_processes": 0,    # 解析进程数: 0为在抓取线程中解析，"auto"为CPU核数 (源很多或feed很大时开启)
+    "parse_min_bytes": 32 * 1024,  # 小于该大小的feed仍在本进程解析
+    "fast_parser": False,    # 格式规范的RSS 2.0/Atom用快速解析器，其他feed仍用feedparser
+    "timeout": 30,           # 单个请求超时(秒)
+    "deadline": 90,          # 全部源的抓取总时限(秒)，超时未完成的源直接丢弃
+}
+
+# HTTP客户端 - 抓取和推送共用的连接池
+HTTP_CONFIG = {
+    "pool_connections": 16,  # 保留连接池的主机数
+    "pool_maxsize": 4,       # 每个主机的最大连接数
+    "retries": 3,            # 连接失败/临时错误的重试次数
+    "backoff_factor": 0.5,   # 重试退避系数 (0.5s, 1s, 2s...)
+    "status_forcelist": [500, 502, 503, 504],  # 429不在会话层重试，交给调用方按 Retry-After 退避
+    "http2": False,          # 启用HTTP/2，需要安装 httpx[http2]
+}
+
 # ==================== 推送配置 ====================
 
 # 飞书配置 (二选一)
@@ -65,6 +111,32 @@ MAX_NEWS_COUNT = 15
 import os
 FEISHU_WEBHOOK = os.environ.get("FEISHU_WEBHOOK", "https://open.feishu.cn/open-apis/bot/v2/hook/c6f7f47f-c2be-4198-9b08-bc0c37097620")  # 飞书群机器人Webhook地址
 
+# 飞书多群推送 - 配置后按列表推送到多个群 (不再单独使用 FEISHU_WEBHOOK)
+# profile 对应 FEISHU_PROFILES 中的关键词方案，不填则收到完整早报
+FEISHU_TARGETS = [
+    # {"name": "电动车组", "webhook": "https://open.feishu.cn/open-apis/bot/v2/hook/xxx", "profile": "ev"},
+]
+
+# 关键词方案 - 在早报新闻中再按群筛选，同一方案的卡片只生成一次
+FEISHU_PROFILES = {
+    # "ev": {"keywords": ["EV", "electric", "battery", "charging"], "exclude_keywords": []},
+}
+
+# 飞书机器人限流 (自定义机器人约 5次/秒、100次/分钟)
+FEISHU_RATE_LIMIT = {
+    "rate": 1.5,             # 每个机器人每秒允许的请求数
+    "burst": 5,              # 令牌桶容量
+    "max_retries": 3,        # 限流/服务端错误的重试次数
+    "concurrency": 8,        # 同时推送的群数
+}
+
+# 飞书卡片大小 - 自定义机器人的请求体上限为20KB，超出时自动拆成多张卡片依次发送
+FEISHU_CARD_CONFIG = {
+    "max_bytes": 18 * 1024,  # 单张卡片序列化后的字节数上限 (预留余量)
+    "max_elements": 40,      # 单张卡片的元素数上限
+    "summary_chars": 200,    # 卡片中摘要的最大字符数
+}
+
 # 邮件配置 (二选一)
 EMAIL_CONFIG = {
     "enabled": False,
@@ -77,7 +149,87 @@ EMAIL_CONFIG = {
     "subject_prefix": "【欧洲汽车早报】"
 }
 
+# 推送执行配置
+NOTIFY_CONFIG = {
+    "channel_timeout": {     # 各渠道单次请求的超时(秒)，渠道之间并发发送；整个渠道超过该时间时只告警，仍等待发送结果
+        "feishu": 30,
+        "email": 60,
+    },
+    "smtp_pool_size": 2,     # SMTP连接池大小，连接在多封邮件之间复用
+}
+
 # ==================== 执行时间配置 ====================
 # 每日执行时间 (UTC+8时区)
 DAILY_HOUR = 7  # 早上7点
 DAILY_MINUTE = 0
+SCHEDULE_UTC_OFFSET = 8  # 定时任务使用的时区 (相对UTC的小时数)
+
+# 常驻模式 (python main.py --daemon) 的定时任务，同一时刻到期的任务按列表顺序执行
+# job: digest 为完整早报；breaking 为突发新闻轮询，只推送尚未推送过、与当天已推送的新闻不相似且命中 keywords 的新闻
+# 固定时刻用 hour/minute，固定间隔用 every_minutes (从零点起对齐)，active_hours 限制执行的时段
+SCHEDULES = [
+    {"name": "早报", "job": "digest", "hour": DAILY_HOUR, "minute": DAILY_MINUTE},
+    {
+        "name": "突发新闻",
+        "job": "breaking",
+        "every_minutes": 10,
+        "active_hours": [8, 22],
+        # 为空时推送所有新的相关新闻 (FILTER_KEYWORDS)
+        "keywords": ["recall", "launch", "unveil", "bankruptcy", "insolvency", "tariff",
+                     "strike", "merger", "acquisition"],
+        "enabled": False,
+    },
+]
+
+# ==================== 运行状态配置 ====================
+# 运行状态目录 (HTTP缓存、已推送索引等)，可通过环境变量覆盖
+STATE_DIR = os.environ.get(
+    "EURO_NEWS_STATE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".state")
+)
+
+# 条件请求缓存 - 保存每个源的ETag/Last-Modified和上次解析结果
+FEED_CACHE = {
+    "enabled": True,
+    "dir": os.path.join(STATE_DIR, "feed_cache"),
+}
+
+# 已推送索引 - 跨天去重，已推送过的新闻在TTL内不再推送
+SEEN_INDEX = {
+    "enabled": True,
+    "path": os.path.join(STATE_DIR, "seen_index.sqlite3"),
+    "ttl_days": 30,
+}
+
+# 新闻归档 - 抓取到的所有新闻写入本地全文索引，可用 python archive.py search 检索
+ARCHIVE = {
+    "enabled": True,
+    "path": os.path.join(STATE_DIR, "archive.sqlite3"),
+}
+
+# 自适应轮询 - 按各源的更新频率决定多久抓取一次，未到时间的源直接使用 FEED_CACHE 中的上次结果
+SOURCE_SCHEDULE = {
+    "enabled": True,
+    "path": os.path.join(STATE_DIR, "source_schedule.json"),
+    "min_interval": 300,          # 最短轮询间隔 (秒)
+    "max_interval": 6 * 3600,     # 最长轮询间隔 (秒)
+    "default_interval": 900,      # 还没有足够数据时的间隔 (秒)
+    "rate_factor": 0.5,           # 轮询间隔 = 条目平均发布间隔 × rate_factor
+    "backoff_base": 300,          # 失败后的首次退避 (秒)，之后逐次翻倍
+    "max_backoff": 3 * 3600,      # 最长退避 (秒)
+    "breaker_threshold": 5,       # 连续失败次数达到后熔断
+    "breaker_cooldown": 12 * 3600,  # 熔断时长 (秒)，之后试探一次
+}
+
+# 日内增量推送 - 记录当天已推送新闻的相似度签名，突发新闻轮询只推送与之前都不相似的新条目
+INTRADAY = {
+    "enabled": True,
+    "path": os.path.join(STATE_DIR, "intraday.json"),
+    "compact": True,              # 增量推送使用精简卡片 (每条一行，不含摘要)
+}
+
+# 运行指标 - 每次运行写出 run_report.json 和 metrics.prom (Prometheus文本格式)
+METRICS_CONFIG = {
+    "enabled": True,
+    "dir": os.path.join(STATE_DIR, "metrics"),
+}
@@ -0,0 +1,15 @@
+"""
+pytest配置
+模块按脚本方式平铺导入 (from config import ...)，测试时把本目录加入sys.path；
+状态目录指向临时目录，避免测试读写 .state 中的真实推送记录
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("EURO_NEWS_STATE_DIR", tempfile.mkdtemp(prefix="euro_news_test_"))
+
+# test_feishu.py 是手动发送测试消息的脚本，不是单元测试
+collect_ignore = ["test_feishu.py"]
@@ -0,0 +1,137 @@
+"""
+日期处理模块
+把RSS/Atom中的日期统一为带时区的UTC时间；常见的RFC-822和ISO-8601格式走快速路径并缓存解析结果，
+注册为feedparser的首选日期解析器，其他格式仍交给feedparser的通用解析
+"""
+
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_tz
+from functools import lru_cache
+from typing import Optional
+import logging
+
+import feedparser
+
+from config import SCHEDULE_UTC_OFFSET
+
+logger = logging.getLogger(__name__)
+
+UTC = timezone.utc
+# 早报展示使用的时区 (与定时任务一致)
+LOCAL_TZ = timezone(timedelta(hours=SCHEDULE_UTC_OFFSET))
+# 没有发布时间的条目排在最后
+MIN_DATETIME = datetime.min.replace(tzinfo=UTC)
+
+_installed = False
+_install_lock = threading.Lock()
+
+# ISO-8601日期时间，小数秒位数和时区写法各不相同 (Python 3.10 的 fromisoformat 只接受 3/6 位小数和 +HH:MM)
+_ISO_RE = re.compile(
+    r"(\d{4}-\d{2}-\d{2})[Tt ](\d{2}:\d{2}(?::\d{2})?)(?:[.,](\d+))?\s*(Z|[+-]\d{2}(?::?\d{2})?)?$",
+    re.IGNORECASE
+)
+
+
+def now_utc() -> datetime:
+    return datetime.now(UTC)
+
+
+def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """转为UTC，不带时区的按UTC处理 (兼容旧缓存)"""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+@lru_cache(maxsize=8192)
+def parse_date(value: str) -> Optional[datetime]:
+    """
+    解析RFC-822 (RSS) 或ISO-8601 (Atom) 日期，返回UTC时间
+    无法识别时返回None
+    """
+    value = value.strip()
+    if not value:
+        return None
+
+    if value[:4].isdigit() and value[4:5] == "-":
+        # ISO-8601: 2026-10-17T08:30:00Z / 2026-10-17T08:30:00.12+0200 / 2026-10-17
+        # 先规范成各Python版本的 fromisoformat 都接受的写法
+        match = _ISO_RE.match(value)
+        if match:
+            day, clock, fraction, zone = match.groups()
+            value = f"{day}T{clock}"
+            if fraction:
+                value += "." + fraction[:6].ljust(6, "0")
+            if zone:
+                digits = "0000" if zone.upper() == "Z" else zone[1:].replace(":", "").ljust(4, "0")
+                value += f"{zone[0] if zone[0] in '+-' else '+'}{digits[:2]}:{digits[2:]}"
+        try:
+            return ensure_utc(datetime.fromisoformat(value))
+        except ValueError:
+            return None
+
+    # RFC-822: Sat, 17 Oct 2026 08:30:00 +0200
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    try:
+        dt = datetime(*parsed[:6], tzinfo=UTC)
+    except ValueError:
+        return None
+    # 未知时区名按UTC处理 (与feedparser一致)
+    return dt - timedelta(seconds=parsed[9] or 0)
+
+
+def from_struct(value) -> Optional[datetime]:
+    """feedparser的 *_parsed 字段 (UTC的struct_time) 转为UTC时间"""
+    if not value:
+        return None
+    try:
+        return datetime(*value[:6], tzinfo=UTC)
+    except (TypeError, ValueError):
+        return None
+
+
+def entry_datetime(entry) -> Optional[datetime]:
+    """条目的发布时间 - published和updated中较新的一个"""
+    published = from_struct(entry.get("published_parsed"))
+    updated = from_struct(entry.get("updated_parsed"))
+    if published is None or (updated is not None and updated > published):
+        return updated
+    return published
+
+
+def _feedparser_handler(value: str) -> Optional[time.struct_time]:
+    dt = parse_date(value)
+    return dt.utctimetuple() if dt is not None else None
+
+
+def install_feedparser_handler():
+    """注册快速日期解析 (只注册一次)，识别不了的格式由feedparser的其他解析器处理"""
+    global _installed
+    with _install_lock:
+        if not _installed:
+            feedparser.registerDateHandler(_feedparser_handler)
+            _installed = True
+
+
+def format_relative(dt: Optional[datetime], now: datetime) -> str:
+    """相对日期: 今天/昨天/N天前，一周以前显示月-日 (本地时区)"""
+    if dt is None:
+        return "未知"
+    diff = now - dt
+
+    # 时钟略有偏差时发布时间可能比当前时间晚
+    if diff.days <= 0:
+        return "今天"
+    elif diff.days == 1:
+        return "昨天"
+    elif diff.days < 7:
+        return f"{diff.days}天前"
+    else:
+        return dt.astimezone(LOCAL_TZ).strftime("%m-%d")
@@ -0,0 +1,184 @@
+"""
+快速feed解析模块
+格式规范的RSS 2.0和Atom 1.0用 ElementTree.iterparse 增量解析，只提取标题、链接、摘要和日期，
+每个条目处理完即释放；结果与feedparser的返回值接口相同 (feed.feed / feed.entries)，
+XML格式错误或超出快速路径支持范围的feed自动交给feedparser
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from typing import Optional
+import logging
+
+import feedparser
+from feedparser import FeedParserDict
+
+from config import FETCH_CONFIG
+from dates import parse_date
+
+logger = logging.getLogger(__name__)
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_SY = "{http://purl.org/rss/1.0/modules/syndication/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+
+_ITEM_TAGS = ("item", _ATOM + "entry")
+
+# 频道级字段 -> feedparser中的键名 (更新间隔提示)
+_CHANNEL_FIELDS = {
+    "ttl": "ttl",
+    _SY + "updatePeriod": "sy_updateperiod",
+    _SY + "updateFrequency": "sy_updatefrequency",
+}
+
+# 条目日期字段 -> feedparser中的键名 (dc:date 在feedparser中对应updated)
+_RSS_DATES = {"pubDate": "published", _DC + "date": "updated"}
+_ATOM_DATES = {_ATOM + "published": "published", _ATOM + "updated": "updated"}
+
+# 可以作为条目链接的Atom链接类型
+_HTML_TYPES = (None, "text/html", "application/xhtml+xml")
+
+
+class FallbackRequired(Exception):
+    """feed超出快速路径支持范围，需要交给feedparser"""
+
+
+def _text(elem) -> str:
+    """元素的文本内容 - 含子元素 (未转义的HTML/XHTML) 时交给feedparser处理"""
+    if len(elem):
+        raise FallbackRequired(f"<{elem.tag}> 含有子元素")
+    return (elem.text or "").strip()
+
+
+def _absolute(link: str) -> str:
+    # 相对链接需要按 xml:base 解析
+    if not link.startswith(("http://", "https://")):
+        raise FallbackRequired(f"非绝对链接: {link[:80]}")
+    return link
+
+
+def _set_date(entry: FeedParserDict, key: str, value: str):
+    if not value:
+        return
+    dt = parse_date(value)
+    if dt is None:
+        # 少见的日期格式由feedparser的通用解析器处理
+        raise FallbackRequired(f"无法识别的日期: {value[:40]}")
+    entry[key] = value
+    entry[key + "_parsed"] = dt.utctimetuple()
+
+
+def _rss_entry(item) -> FeedParserDict:
+    entry = FeedParserDict()
+    content = None
+    guid = None
+    for child in item:
+        tag = child.tag
+        if tag == "title":
+            entry["title"] = _text(child)
+        elif tag == "link":
+            entry["link"] = _absolute(_text(child))
+        elif tag == "description":
+            entry["summary"] = _text(child)
+        elif tag == _CONTENT + "encoded":
+            content = _text(child)
+        elif tag == "guid":
+            guid = child
+        elif tag in _RSS_DATES:
+            _set_date(entry, _RSS_DATES[tag], _text(child))
+
+    if "link" not in entry:
+        # 与feedparser一致: 没有<link>时用permalink形式的guid
+        if guid is None or guid.get("isPermaLink", "true").lower() == "false":
+            raise FallbackRequired("条目没有链接")
+        entry["link"] = _absolute(_text(guid))
+    if "summary" not in entry and content is not None:
+        entry["summary"] = content
+    return entry
+
+
+def _atom_entry(item) -> FeedParserDict:
+    entry = FeedParserDict()
+    content = None
+    for child in item:
+        tag = child.tag
+        if tag == _ATOM + "title":
+            entry["title"] = _text(child)
+        elif tag == _ATOM + "link":
+            if child.get("rel", "alternate") != "alternate" or child.get("type") not in _HTML_TYPES:
+                continue
+            if "link" in entry:
+                raise FallbackRequired("条目有多个alternate链接")
+            entry["link"] = _absolute(child.get("href", "").strip())
+        elif tag == _ATOM + "summary":
+            entry["summary"] = _text(child)
+        elif tag == _ATOM + "content":
+            if child.get("src"):
+                raise FallbackRequired("外部content")
+            content = _text(child)
+        elif tag in _ATOM_DATES:
+            _set_date(entry, _ATOM_DATES[tag], _text(child))
+
+    if "link" not in entry:
+        raise FallbackRequired("条目没有链接")
+    if "summary" not in entry and content is not None:
+        entry["summary"] = content
+    return entry
+
+
+def parse_fast(content: bytes) -> FeedParserDict:
+    """
+    快速路径解析，返回与 feedparser.parse 相同结构的结果
+    XML格式错误时抛出 ET.ParseError，不支持的格式抛出 FallbackRequired
+    """
+    events = ET.iterparse(io.BytesIO(content), events=("start", "end"))
+
+    _, root = next(events)
+    if root.tag == "rss":
+        version, build_entry = "rss20", _rss_entry
+    elif root.tag == _ATOM + "feed":
+        version, build_entry = "atom10", _atom_entry
+    else:
+        raise FallbackRequired(f"不支持的根元素: {root.tag}")
+    if root.get(_XML_BASE) is not None:
+        raise FallbackRequired("使用了xml:base")
+
+    feed_meta = FeedParserDict()
+    entries = []
+    depth = 0
+    for event, elem in events:
+        if event == "start":
+            if elem.get(_XML_BASE) is not None:
+                raise FallbackRequired("使用了xml:base")
+            if elem.tag in _ITEM_TAGS:
+                depth += 1
+            continue
+
+        if elem.tag in _ITEM_TAGS:
+            depth -= 1
+            if depth:
+                raise FallbackRequired("条目嵌套")
+            entries.append(build_entry(elem))
+            # 条目处理完即释放子元素，大feed的内存占用不随条目数增长
+            elem.clear()
+        elif not depth and elem.tag in _CHANNEL_FIELDS:
+            feed_meta[_CHANNEL_FIELDS[elem.tag]] = _text(elem)
+
+    return FeedParserDict(feed=feed_meta, entries=entries, bozo=False, version=version)
+
+
+def parse(content: bytes, fast: Optional[bool] = None) -> FeedParserDict:
+    """
+    解析feed，fast为None时按 FETCH_CONFIG["fast_parser"]
+    快速路径失败时回退到feedparser，结果的字段处理不变
+    """
+    if fast is None:
+        fast = FETCH_CONFIG.get("fast_parser", False)
+    if fast:
+        try:
+            return parse_fast(content)
+        except (ET.ParseError, FallbackRequired) as e:
+            logger.debug(f"快速解析不适用，使用feedparser: {str(e)}")
+    return feedparser.parse(content)
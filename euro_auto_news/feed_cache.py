@@ -0,0 +1,94 @@
+"""
+RSS条件请求缓存模块
+按源保存ETag/Last-Modified和上次解析出的新闻条目，
+源未更新(HTTP 304)时直接复用缓存，无需重新下载和解析
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import List, Dict, Optional
+import logging
+
+from dates import ensure_utc
+from models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """基于磁盘的RSS源缓存 - 每个源一个JSON文件"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        """缓存文件路径"""
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def load(self, url: str) -> Optional[Dict]:
+        """读取缓存，不存在或损坏时返回None"""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("url") != url:
+                return None
+            data["items"] = [self._decode_item(item) for item in data.get("items", [])]
+            return data
+        except Exception as e:
+            logger.warning(f"读取缓存失败 [{url}]: {str(e)}")
+            return None
+
+    def save(self, url: str, etag: Optional[str], last_modified: Optional[str], items: List[Dict]):
+        """写入缓存 - 没有校验头时不能做条件请求，但仍供自适应轮询在源未到期时复用"""
+        data = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "items": [self._encode_item(item) for item in items],
+        }
+
+        # 先写临时文件再替换，避免中断时留下半个文件
+        path = self._path(url)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"写入缓存失败 [{url}]: {str(e)}")
+
+    @staticmethod
+    def conditional_headers(cached: Optional[Dict]) -> Dict[str, str]:
+        """根据缓存生成条件请求头"""
+        headers = {}
+        if not cached:
+            return headers
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    @staticmethod
+    def _encode_item(item: Dict) -> Dict:
+        """新闻条目转为可JSON序列化的格式"""
+        data = {k: v for k, v in item.items() if k != "published_str"}
+        published = item.get("published")
+        data["published"] = published.isoformat() if published else None
+        return data
+
+    @staticmethod
+    def _decode_item(data: Dict) -> NewsItem:
+        """从缓存格式还原新闻条目 (published_str按本次运行的时间重新生成)"""
+        item = dict(data)
+        if item.get("published"):
+            item["published"] = ensure_utc(datetime.fromisoformat(item["published"]))
+        return NewsItem.from_dict(item)
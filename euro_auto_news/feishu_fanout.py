@@ -0,0 +1,206 @@
+"""
+飞书多群推送模块
+按关键词方案为每组群生成一次卡片，并发推送到多个Webhook，
+每个机器人单独令牌桶限流，遇到限流或服务端错误时退避重试，最后输出逐群的推送报告；
+超出大小限制的早报拆成多张卡片，同一个群内按顺序发送
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import logging
+
+from config import FEISHU_PROFILES, FEISHU_RATE_LIMIT
+from http_client import get_http_client, HTTP_ERRORS
+from matcher import KeywordMatcher
+from models import match_text
+from processor import serialize_card
+
+logger = logging.getLogger(__name__)
+
+# 飞书返回的限流类错误码，可以重试
+RETRYABLE_CODES = {9499, 11232, 11233}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """令牌桶 - rate为每秒补充的令牌数，capacity为突发上限"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取一个令牌，不足时等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FeishuFanout:
+    """飞书多群推送"""
+
+    def __init__(self, targets: List[Dict], profiles: Optional[Dict] = None,
+                 rate_limit: Optional[Dict] = None, timeout: float = 30):
+        self.targets = targets
+        self.profiles = FEISHU_PROFILES if profiles is None else profiles
+        self.rate_limit = rate_limit or FEISHU_RATE_LIMIT
+        self.timeout = timeout
+        self.http = get_http_client()
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, webhook: str) -> TokenBucket:
+        """每个机器人 (Webhook) 一个令牌桶"""
+        with self._buckets_lock:
+            bucket = self._buckets.get(webhook)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_limit.get("rate", 1.5), self.rate_limit.get("burst", 5))
+                self._buckets[webhook] = bucket
+            return bucket
+
+    def render_cards(self, processed_news) -> Dict[Optional[str], List[dict]]:
+        """为每个用到的关键词方案生成一次卡片 (可能拆成多张)，None为完整早报"""
+        cards = {}
+        for target in self.targets:
+            profile = target.get("profile")
+            if profile in cards:
+                continue
+            if profile is None or profile not in self.profiles or not hasattr(processed_news, "news_list"):
+                if profile is not None and profile not in self.profiles:
+                    logger.warning(f"未定义的关键词方案: {profile}，发送完整早报")
+                cards[profile] = processed_news["feishu_cards"]
+            else:
+                cards[profile] = self._render_profile(processed_news, self.profiles[profile])
+        return cards
+
+    @staticmethod
+    def _render_profile(processed_news, profile: Dict) -> List[dict]:
+        """按方案筛选后生成卡片；增量推送 (精简卡片) 没有匹配的新闻时返回空列表，该方案的群不推送"""
+        include = KeywordMatcher(profile.get("keywords", []))
+        exclude = KeywordMatcher(profile.get("exclude_keywords", []))
+
+        news_list = []
+        for news in processed_news.news_list:
+            text = match_text(news)
+            if include and not include.search(text):
+                continue
+            if exclude.search(text):
+                continue
+            news_list.append(news)
+
+        # 早报照常发送"今日暂无"，增量推送每次轮询都发一张空卡片只会刷屏
+        if not news_list and processed_news.processor.compact:
+            return []
+        return processed_news.processor.generate_feishu_cards(news_list)
+
+    def deliver(self, processed_news) -> List[Dict]:
+        """推送到所有群，返回逐群报告"""
+        if not self.targets:
+            return []
+
+        cards = self.render_cards(processed_news)
+        workers = max(1, min(self.rate_limit.get("concurrency", 8), len(self.targets)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feishu") as executor:
+            futures = [
+                executor.submit(self._deliver_one, target, cards[target.get("profile")])
+                for target in self.targets
+            ]
+            report = [future.result() for future in futures]
+
+        skipped = sum(1 for r in report if r.get("skipped"))
+        ok = sum(1 for r in report if r["success"] and not r.get("skipped"))
+        logger.info(f"飞书多群推送: {ok}/{len(report) - skipped} 个群成功"
+                    + (f"，{skipped} 个群没有匹配的新闻" if skipped else ""))
+        for r in report:
+            if not r["success"]:
+                logger.error(f"  -> {r['name']}: {r.get('error')} "
+                             f"(已发送 {r['sent']}/{r['cards']} 张卡片，尝试 {r['attempts']} 次)")
+        return report
+
+    def _deliver_one(self, target: Dict, cards: List[dict]) -> Dict:
+        """按顺序发送一个群的全部卡片，某一张重试后仍失败则停止"""
+        webhook = target["webhook"]
+        bucket = self._bucket(webhook)
+        result = {"name": target.get("name", webhook), "profile": target.get("profile"),
+                  "success": False, "attempts": 0, "cards": len(cards), "sent": 0}
+        if not cards:
+            # 没有需要推送的内容，不算失败
+            result.update(success=True, skipped=True, seconds=0.0)
+            return result
+        start = time.monotonic()
+
+        for card in cards:
+            if not self._post_card(webhook, serialize_card(card), bucket, result):
+                break
+            result["sent"] += 1
+        else:
+            result["success"] = True
+            result.pop("error", None)
+
+        result["seconds"] = round(time.monotonic() - start, 3)
+        return result
+
+    def _post_card(self, webhook: str, payload: bytes, bucket: TokenBucket, result: Dict) -> bool:
+        """发送一张卡片，限流和服务端错误时退避重试，attempts/error记录在result中"""
+        max_retries = self.rate_limit.get("max_retries", 3)
+
+        for attempt in range(max_retries + 1):
+            bucket.acquire()
+            result["attempts"] += 1
+            retry_after = None
+
+            try:
+                response = self.http.post(
+                    webhook,
+                    headers={"Content-Type": "application/json; charset=utf-8"},
+                    data=payload,
+                    timeout=self.timeout
+                )
+                if response.status_code == 200:
+                    body = response.json()
+                    code = body.get("code", body.get("StatusCode"))
+                    if code == 0:
+                        return True
+                    result["error"] = f"code={code} {body.get('msg', '')}".strip()
+                    if code not in RETRYABLE_CODES:
+                        return False
+                else:
+                    result["error"] = f"HTTP {response.status_code}"
+                    if response.status_code not in RETRYABLE_STATUS:
+                        return False
+                    retry_after = response.headers.get("Retry-After")
+            except ValueError as e:
+                # 返回内容不是JSON (requests的JSONDecodeError同时也是RequestException，需先捕获)
+                result["error"] = f"响应解析失败: {str(e)}"
+                return False
+            except HTTP_ERRORS as e:
+                result["error"] = str(e)
+
+            if attempt < max_retries:
+                time.sleep(self._backoff(attempt, retry_after))
+
+        return False
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        """退避时间 - 优先使用 Retry-After"""
+        if retry_after:
+            try:
+                return min(60.0, float(retry_after))
+            except ValueError:
+                pass
+        return min(30.0, 2 ** attempt) * (0.5 + random.random() / 2)
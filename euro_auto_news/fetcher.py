@@ -3,14 +3,36 @@
 从RSS源获取欧洲汽车新闻
 """
 
-import feedparser
-import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, List, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+import calendar
+import heapq
+import threading
 import time
 import logging
 
-from config import RSS_SOURCES, FILTER_KEYWORDS, EXCLUDE_KEYWORDS, MAX_NEWS_COUNT
+from config import (
+    RSS_SOURCES, FILTER_KEYWORDS, EXCLUDE_KEYWORDS, MAX_NEWS_COUNT,
+    FETCH_CONFIG, FEED_CACHE, DEDUP_CONFIG, RANKING_CONFIG
+)
+import fast_feed
+from feed_cache import FeedCache
+from archive import get_archive
+from dates import UTC, MIN_DATETIME, entry_datetime, format_relative, install_feedparser_handler, now_utc
+from models import NewsItem, match_text, set_reference_time
+from parse_pool import get_parse_pool
+from source_scheduler import get_source_scheduler, feed_hint, parse_retry_after
+from seen_index import get_seen_index, item_keys
+from near_dup import NearDuplicateIndex
+from matcher import KeywordMatcher
+from http_client import get_http_client, HTTP_ERRORS
+from html_text import html_to_text
+from metrics import RunMetrics
+from ranking import Ranker
 
 # 配置日志
 logging.basicConfig(
@@ -19,72 +41,447 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 摘要长度上限
+SUMMARY_MAX_CHARS = 500
+
+
+class HostThrottle:
+    """按主机限流 - 限制同一主机的并发数，并保证两次请求之间的最小间隔"""
+
+    def __init__(self, max_concurrent: int, interval: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        """占用目标主机的一个请求名额"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.max_concurrent)
+                self._semaphores[host] = semaphore
+
+        with semaphore:
+            # 预约下一个可用时间点，避免对同一主机请求过快
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot.get(host, now))
+                self._next_slot[host] = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class NewsSelector:
+    """候选新闻筛选 - 去重、关键词过滤、取前K条，实时抓取和历史回放 (backfill) 共用"""
+
+    def __init__(self, metrics: Optional[RunMetrics] = None, now: Optional[datetime] = None):
+        self.metrics = metrics or RunMetrics()
+        # 时效打分的参考时间
+        self.now = now or now_utc()
+        self.include_matcher = KeywordMatcher(FILTER_KEYWORDS)
+        self.exclude_matcher = KeywordMatcher(EXCLUDE_KEYWORDS)
+
+    def select(self, news_iter: Iterable[Dict], k: int = MAX_NEWS_COUNT,
+               predicates: Optional[Dict[str, Callable[[Dict], bool]]] = None) -> List[Dict]:
+        """
+        逐条流式过滤、去重，只保留前k条
+        先过滤再合并相似新闻: 否则第一篇转载命中排除关键词时，整组新闻都会被丢掉
+        predicates: 附加筛选条件 (名称 -> 判断函数)，与关键词过滤一起在合并和取前k条之前应用，丢弃数按名称统计
+        """
+        news_iter = self.iter_filter(news_iter)
+        if predicates:
+            news_iter = self.iter_accepted(news_iter, predicates)
+        news_iter = self.iter_deduplicate(news_iter)
+        if RANKING_CONFIG.get("enabled"):
+            return self.top_by_score(news_iter, k)
+        return self.top_by_date(news_iter, k)
+
+    def deduplicate(self, news_list: List[Dict]) -> List[Dict]:
+        """去重 - 基于链接和标题相似度"""
+        return list(self.iter_deduplicate(news_list))
+
+    def iter_deduplicate(self, news_iter: Iterable[Dict]) -> Iterator[Dict]:
+        """流式去重 - 完全相同的链接，以及不同媒体转载的相似新闻"""
+        seen = set()
+        near_dup = None
+        if DEDUP_CONFIG.get("near_duplicate"):
+            options = {k: v for k, v in DEDUP_CONFIG.items() if k != "near_duplicate"}
+            near_dup = NearDuplicateIndex(**options)
+
+        for news in news_iter:
+            start = time.perf_counter()
+            dropped_by = None
+
+            # 使用链接或标题的简化版作为唯一标识
+            key = news.get("link", "") or news.get("title", "")
+            key = key.lower().strip()
+
+            # 简单去重：完全相同的链接
+            if not key or key in seen:
+                dropped_by = "dedup"
+            else:
+                seen.add(key)
+                # 相似去重：合并到已有的同一新闻上
+                if near_dup is not None and near_dup.add(news) is not None:
+                    dropped_by = "near_dup"
+
+            self.metrics.add_time("dedup", time.perf_counter() - start)
+            if dropped_by:
+                self.metrics.count_dropped(dropped_by)
+                continue
+
+            yield news
+
+    def filter_news(self, news_list: List[Dict]) -> List[Dict]:
+        """过滤新闻 - 命中的关键词记录在 keyword_hits 中"""
+        return list(self.iter_filter(news_list))
+
+    def iter_filter(self, news_iter: Iterable[Dict]) -> Iterator[Dict]:
+        """流式过滤"""
+        if not self.include_matcher:
+            yield from news_iter
+            return
+
+        for news in news_iter:
+            start = time.perf_counter()
+            text = match_text(news)
+            dropped_by = None
+
+            # 检查是否包含关键词
+            hits = self.include_matcher.find(text)
+            if not hits:
+                dropped_by = "filter"
+            # 检查是否需要排除
+            elif self.exclude_matcher.search(text):
+                dropped_by = "exclude"
+            else:
+                news["keyword_hits"] = sorted(hits)
+
+            self.metrics.add_time("filter", time.perf_counter() - start)
+            if dropped_by:
+                self.metrics.count_dropped(dropped_by)
+                continue
 
-class NewsFetcher:
+            yield news
+
+    def iter_accepted(self, news_iter: Iterable[Dict],
+                      predicates: Dict[str, Callable[[Dict], bool]]) -> Iterator[Dict]:
+        """流式应用附加筛选条件"""
+        for news in news_iter:
+            for name, accept in predicates.items():
+                if not accept(news):
+                    self.metrics.count_dropped(name)
+                    break
+            else:
+                yield news
+
+    def sort_by_date(self, news_list: List[Dict]) -> List[Dict]:
+        """按日期排序 - 最新的在前"""
+        return sorted(news_list, key=self._date_key, reverse=True)
+
+    def top_by_date(self, news_iter: Iterable[Dict], k: int) -> List[Dict]:
+        """
+        最新的前k条 - 用大小为k的堆代替全量排序，结果与 sort_by_date(...)[:k] 一致
+        (只限定了这一步保留的条目数；开启相似合并时 NearDuplicateIndex 仍引用每组的代表新闻)
+        """
+        # 堆顶是当前第k新的条目；日期相同时先到的优先，与稳定排序一致
+        heap = []
+        total = 0
+        for news in news_iter:
+            start = time.perf_counter()
+            entry = (self._date_key(news), -total, news)
+            total += 1
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif k > 0 and entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+            self.metrics.add_time("sort", time.perf_counter() - start)
+
+        self.metrics.count_dropped("sort", total - len(heap))
+        return [news for _, _, news in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+    def top_by_score(self, news_iter: Iterable[Dict], k: int) -> List[Dict]:
+        """
+        分数最高的前k条 (见 ranking.Ranker)
+        转载数在整个流去重完之后才确定，所以先收集全部候选再整批打分:
+        内存随过滤、去重后的候选数增长，不受k限制 (top_by_date 的定长堆只在关闭 RANKING_CONFIG 时生效)。
+        候选本身已被相似合并索引引用，这里额外的只是列表和每条一个特征元组
+        """
+        candidates = list(news_iter)
+        with self.metrics.timer("sort"):
+            top = Ranker(now=self.now).top_k(candidates, k)
+        self.metrics.count_dropped("sort", len(candidates) - len(top))
+        return top
+
+    @staticmethod
+    def _date_key(news: Dict) -> datetime:
+        return news.get("published") or MIN_DATETIME
+
+
+class NewsFetcher(NewsSelector):
     """新闻抓取器"""
 
-    def __init__(self):
+    def __init__(self, metrics: Optional[RunMetrics] = None):
+        super().__init__(metrics)
         self.news_list = []
+        # 本次运行的参考时间 (self.now)，相对日期和时效打分都以它为准
+        set_reference_time(self.now)
+        install_feedparser_handler()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        self.feed_cache = FeedCache(FEED_CACHE["dir"]) if FEED_CACHE.get("enabled") else None
+        self.seen_index = get_seen_index()
+        self.archive = get_archive()
+        # 自适应轮询依赖缓存提供未到期源的上次结果
+        self.source_scheduler = get_source_scheduler() if self.feed_cache else None
+        self.http = get_http_client()
+        self.parse_pool = get_parse_pool()
+
+    def fetch_all(self, predicates: Optional[Dict[str, Callable[[Dict], bool]]] = None) -> List[Dict]:
+        """从所有启用的RSS源并发抓取新闻 - 逐源流式去重、过滤，只保留前K条"""
+        return self.select(self.iter_fetched(), MAX_NEWS_COUNT, predicates)
+
+    def iter_fetched(self) -> Iterator[Dict]:
+        """并发抓取，按配置顺序逐源产出新闻条目"""
+        sources = [s for s in RSS_SOURCES if s.get("enabled", True)]
+
+        deadline = time.monotonic() + FETCH_CONFIG.get("deadline", 90)
+        throttle = HostThrottle(
+            FETCH_CONFIG.get("per_host_limit", 2),
+            FETCH_CONFIG.get("host_interval", 1.0)
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=FETCH_CONFIG.get("max_workers", 8),
+            thread_name_prefix="fetcher"
+        )
+        futures = {
+            executor.submit(self._fetch_source, source, throttle, deadline): index
+            for index, source in enumerate(sources)
+        }
 
-    def fetch_all(self) -> List[Dict]:
-        """从所有启用的RSS源抓取新闻"""
-        all_news = []
-
-        for source in RSS_SOURCES:
-            if not source.get("enabled", True):
-                continue
+        # 先完成的源暂存，等前面的源处理完再输出，保证去重结果稳定
+        pending = {}
+        next_index = 0
 
+        try:
+            remaining = max(0.0, deadline - time.monotonic())
+            for future in as_completed(futures, timeout=remaining):
+                index = futures[future]
+                try:
+                    news_items = future.result()
+                    logger.info(f"  -> {sources[index]['name']}: 获取到 {len(news_items)} 条新闻")
+                except Exception as e:
+                    logger.error(f"  -> {sources[index]['name']}: 抓取失败: {str(e)}")
+                    news_items = []
+                pending[index] = news_items
+
+                while next_index in pending:
+                    yield from pending.pop(next_index)
+                    next_index += 1
+        except FuturesTimeoutError:
+            missed_futures = [(f, sources[i]) for f, i in futures.items() if not f.done()]
+            missed = [source for _, source in missed_futures]
+            for source in missed:
+                self.metrics.record_source(source["name"], status="timeout")
+            self.metrics.incr("sources_timeout", len(missed))
+            logger.warning(f"抓取超时，已丢弃 {len(missed)} 个源: {', '.join(s['name'] for s in missed)}")
+            if self.source_scheduler:
+                # 正在请求的源记为失败，一直挂起的源才会退避和熔断，而不是每次都耗尽抓取时限；
+                # 还在排队、没有开始的源不是它们自己的问题，不记录。
+                # 在下面save之前记录: 之后才结束的工作线程的结果不再保存 (单次运行中直接丢弃)
+                for future, source in missed_futures:
+                    if future.running():
+                        self.source_scheduler.record_failure(source["url"])
+        finally:
+            # 不等待超时的源，未开始的任务直接取消
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.source_scheduler:
+                self.source_scheduler.save()
+
+        # 超时被丢弃的源之后已完成的部分
+        for index in sorted(pending):
+            yield from pending[index]
+
+    def _fetch_source(self, source: Dict, throttle: HostThrottle, deadline: float) -> List[Dict]:
+        """在工作线程中抓取单个源，遵守主机限流和总时限；未到轮询时间的源使用缓存"""
+        status = self.source_scheduler.poll_status(source["url"]) if self.source_scheduler else "due"
+        if status != "due":
+            cached = self.feed_cache.load(source["url"])
+            # 没有缓存的源照常抓取，但退避/熔断中的源不再请求
+            if cached or status != "not_due":
+                logger.info(f"  -> {source['name']}: 暂不抓取 ({status})" + ("，使用缓存" if cached else ""))
+                self.metrics.incr("sources_skipped")
+                if not cached:
+                    self.metrics.record_source(source["name"], status=status)
+                    return []
+                return self._cached_items(source["name"], cached, status)
+
+        with throttle.slot(source["url"]):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"已超过抓取时限，跳过: {source['name']}")
+                return []
             logger.info(f"正在抓取: {source['name']}")
-            try:
-                news_items = self.fetch_rss(source)
-                all_news.extend(news_items)
-                logger.info(f"  -> 获取到 {len(news_items)} 条新闻")
-            except Exception as e:
-                logger.error(f"  -> 抓取失败: {str(e)}")
-
-            # 避免请求过快
-            time.sleep(1)
-
-        # 去重并排序
-        all_news = self.deduplicate(all_news)
-        all_news = self.filter_news(all_news)
-        all_news = self.sort_by_date(all_news)
+            timeout = min(FETCH_CONFIG.get("timeout", 30), remaining)
+            return self.fetch_rss(source, timeout=timeout)
 
-        # 限制数量
-        return all_news[:MAX_NEWS_COUNT]
-
-    def fetch_rss(self, source: Dict) -> List[Dict]:
+    def fetch_rss(self, source: Dict, timeout: float = 30) -> List[Dict]:
         """从单个RSS源抓取新闻"""
         url = source["url"]
         name = source["name"]
 
         try:
-            # 使用requests获取RSS内容
-            response = requests.get(url, headers=self.headers, timeout=30)
+            # 带上缓存的校验头发起条件请求
+            cached = self.feed_cache.load(url) if self.feed_cache else None
+            headers = dict(self.headers)
+            headers.update(FeedCache.conditional_headers(cached))
+
+            # 通过共享连接池获取RSS内容
+            with self.metrics.timer("fetch", name):
+                response = self.http.get(url, headers=headers, timeout=timeout)
+                content = response.content
+            self.metrics.record_source(name, bytes=len(content), http_status=response.status_code)
+
+            # 源未更新，直接复用上次的解析结果
+            if response.status_code == 304 and cached:
+                logger.info(f"  -> {name}: 未更新，使用缓存")
+                if self.source_scheduler:
+                    self.source_scheduler.record_success(url, not_modified=True)
+                return self._cached_items(name, cached, "not_modified")
+
             response.raise_for_status()
 
             # 解析RSS
-            feed = feedparser.parse(response.content)
-
-            news_items = []
-            for entry in feed.entries:
-                news_item = self.parse_entry(entry, name)
-                if news_item:
-                    news_items.append(news_item)
+            if self.parse_pool is not None and self.parse_pool.accepts(content):
+                news_items = self._parse_in_pool(url, name, content)
+            else:
+                news_items = self._parse_local(url, name, content)
+            self.metrics.record_source(name, status="ok", items=len(news_items))
+
+            # 每个源一批写入归档
+            if self.archive is not None and news_items:
+                with self.metrics.timer("archive", name):
+                    self.archive.add_many(news_items)
+
+            if self.feed_cache:
+                self.feed_cache.save(
+                    url,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    news_items
+                )
 
             return news_items
 
-        except requests.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"请求失败 [{name}]: {str(e)}")
+            self.metrics.record_source(name, status="request_error")
+            if self.source_scheduler:
+                # 429/503等响应可能带有 Retry-After
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("Retry-After") if response is not None else None
+                self.source_scheduler.record_failure(url, parse_retry_after(retry_after))
             return []
         except Exception as e:
             logger.error(f"解析失败 [{name}]: {str(e)}")
+            self.metrics.record_source(name, status="parse_error")
+            if self.source_scheduler:
+                self.source_scheduler.record_failure(url)
             return []
 
-    def parse_entry(self, entry, source_name: str) -> Optional[Dict]:
+    def _parse_local(self, url: str, name: str, content: bytes) -> List[NewsItem]:
+        """在当前线程中解析"""
+        with self.metrics.timer("parse", name):
+            feed = fast_feed.parse(content)
+
+        if self.source_scheduler:
+            self.source_scheduler.record_success(
+                url,
+                timestamps=[self._entry_timestamp(entry) for entry in feed.entries],
+                hint=feed_hint(feed.feed)
+            )
+
+        # URL已推送过的条目直接跳过，不再解析和清洗
+        entries = self._drop_delivered(
+            feed.entries,
+            lambda entry: (entry.get("link", ""), entry.get("title", ""), "")
+        )
+
+        news_items = []
+        for entry in entries:
+            news_item = self.parse_entry(entry, name)
+            if news_item:
+                news_items.append(news_item)
+        self.metrics.count_dropped("parse", len(entries) - len(news_items))
+        # 换了URL的同一篇文章按标题和清洗后的摘要判断
+        return self._drop_delivered(news_items, lambda item: (item.link, item.title, item.summary))
+
+    def _parse_in_pool(self, url: str, name: str, content: bytes) -> List[NewsItem]:
+        """在解析进程池中解析和清洗，本进程只组装条目"""
+        result = self.parse_pool.parse(content, SUMMARY_MAX_CHARS)
+        records = result["records"]
+        self.metrics.add_time("parse", result["parse_seconds"], name)
+        self.metrics.add_time("clean", result["clean_seconds"], name)
+
+        if self.source_scheduler:
+            self.source_scheduler.record_success(
+                url,
+                timestamps=[record[3] for record in records],
+                hint=result["hint"]
+            )
+
+        news_items = [
+            NewsItem(
+                title=title,
+                link=link,
+                summary=summary,
+                source=name,
+                published=datetime.fromtimestamp(published, UTC) if published is not None else None,
+            )
+            for title, link, summary, published in records
+        ]
+        self.metrics.count_dropped("parse", result["entries"] - len(news_items))
+        return self._drop_delivered(news_items, lambda item: (item.link, item.title, item.summary))
+
+    def _cached_items(self, name: str, cached: Dict, status: str) -> List[Dict]:
+        """使用缓存中上次的解析结果 (去掉之后已推送过的条目)"""
+        items = self._drop_delivered(cached["items"], lambda item: (item["link"], item["title"], item.get("summary", "")))
+        self.metrics.record_source(name, status=status, items=len(items))
+        return items
+
+    @staticmethod
+    def _entry_timestamp(entry) -> Optional[float]:
+        """条目的发布时间戳，用于估计源的更新频率"""
+        parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        try:
+            return calendar.timegm(parsed) if parsed else None
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def _drop_delivered(self, entries: List, get_key) -> List:
+        """过滤掉已推送过的条目 (一次批量查询)"""
+        if self.seen_index is None or not entries:
+            return entries
+
+        entry_keys = [item_keys(*get_key(entry)) for entry in entries]
+        seen = self.seen_index.seen_keys(key for keys in entry_keys for key in keys)
+        if not seen:
+            return entries
+
+        result = [
+            entry for entry, keys in zip(entries, entry_keys)
+            if not any(key in seen for key in keys)
+        ]
+        self.metrics.count_dropped("delivered", len(entries) - len(result))
+        return result
+
+    def parse_entry(self, entry, source_name: str) -> Optional[NewsItem]:
         """解析单个RSS条目"""
         try:
             # 获取标题
@@ -99,119 +496,42 @@ class NewsFetcher:
 
             # 获取摘要/描述
             summary = ""
-            if hasattr(entry, "summary"):
-                summary = self.clean_html(entry.summary)
-            elif hasattr(entry, "description"):
-                summary = self.clean_html(entry.description)
-
-            # 获取发布时间
-            published = None
-            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                try:
-                    published = datetime(*entry.published_parsed[:6])
-                except:
-                    pass
-
-            if hasattr(entry, "updated_parsed") and entry.updated_parsed:
-                try:
-                    updated = datetime(*entry.updated_parsed[:6])
-                    if published is None or updated > published:
-                        published = updated
-                except:
-                    pass
-
-            return {
-                "title": title,
-                "link": link,
-                "summary": summary[:500] if summary else "",  # 限制摘要长度
-                "source": source_name,
-                "published": published,
-                "published_str": self.format_date(published) if published else "未知"
-            }
+            with self.metrics.timer("clean", source_name):
+                if hasattr(entry, "summary"):
+                    summary = self.clean_html(entry.summary, SUMMARY_MAX_CHARS)
+                elif hasattr(entry, "description"):
+                    summary = self.clean_html(entry.description, SUMMARY_MAX_CHARS)
+
+            # 获取发布时间 (UTC)
+            published = entry_datetime(entry)
+
+            # 相对日期 (published_str) 在渲染时才生成
+            return NewsItem(
+                title=title,
+                link=link,
+                summary=summary,
+                source=source_name,
+                published=published,
+            )
 
         except Exception as e:
             logger.debug(f"解析条目失败: {str(e)}")
             return None
 
-    def clean_html(self, html_text: str) -> str:
-        """清理HTML标签"""
-        if not html_text:
-            return ""
-
-        import re
-        # 移除HTML标签
-        text = re.sub(r'<[^>]+>', '', html_text)
-        # 移除多余空白
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+    def clean_html(self, html_text: str, max_chars: Optional[int] = None) -> str:
+        """清理HTML标签并解码实体，max_chars为结果长度上限"""
+        return html_to_text(html_text, max_chars)
 
     def format_date(self, dt: datetime) -> str:
         """格式化日期"""
-        if dt is None:
-            return "未知"
-        now = datetime.now()
-        diff = now - dt
-
-        if diff.days == 0:
-            return "今天"
-        elif diff.days == 1:
-            return "昨天"
-        elif diff.days < 7:
-            return f"{diff.days}天前"
-        else:
-            return dt.strftime("%m-%d")
-
-    def deduplicate(self, news_list: List[Dict]) -> List[Dict]:
-        """去重 - 基于标题相似度"""
-        seen = set()
-        result = []
-
-        for news in news_list:
-            # 使用链接或标题的简化版作为唯一标识
-            key = news.get("link", "") or news.get("title", "")
-            key = key.lower().strip()
-
-            # 简单去重：完全相同的链接
-            if key and key not in seen:
-                seen.add(key)
-                result.append(news)
-
-        return result
-
-    def filter_news(self, news_list: List[Dict]) -> List[Dict]:
-        """过滤新闻"""
-        if not FILTER_KEYWORDS:
-            return news_list
-
-        filtered = []
-        for news in news_list:
-            title = news.get("title", "").lower()
-            summary = news.get("summary", "").lower()
-            text = title + " " + summary
-
-            # 检查是否包含关键词
-            if any(kw.lower() in text for kw in FILTER_KEYWORDS):
-                # 检查是否需要排除
-                if EXCLUDE_KEYWORDS:
-                    if any(excl.lower() in text for excl in EXCLUDE_KEYWORDS):
-                        continue
-                filtered.append(news)
-
-        return filtered
-
-    def sort_by_date(self, news_list: List[Dict]) -> List[Dict]:
-        """按日期排序 - 最新的在前"""
-        return sorted(
-            news_list,
-            key=lambda x: x.get("published") or datetime.min,
-            reverse=True
-        )
+        return format_relative(dt, self.now)
 
 
-def fetch_news() -> List[Dict]:
-    """获取新闻的便捷函数"""
-    fetcher = NewsFetcher()
-    return fetcher.fetch_all()
+def fetch_news(metrics: Optional[RunMetrics] = None,
+               predicates: Optional[Dict[str, Callable[[Dict], bool]]] = None) -> List[Dict]:
+    """获取新闻的便捷函数 (predicates见 NewsSelector.select)"""
+    fetcher = NewsFetcher(metrics)
+    return fetcher.fetch_all(predicates)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""
+HTML转纯文本模块
+去掉标签、脚本/样式块和注释并解码HTML实体；
+指定长度上限时先定位截断点，只转换需要的前缀部分
+"""
+
+import re
+from html import unescape
+from typing import Optional
+
+# 块级标签前后视为有空白，避免 "<p>a</p><p>b</p>" 粘连成 "ab"
+_BLOCK_TAGS = (
+    "p", "br", "div", "li", "ul", "ol", "tr", "td", "th", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "figure",
+    "figcaption", "section", "article", "header", "footer", "hr", "pre",
+)
+
+# 替换为空白: 脚本/样式块(连同内容)、注释、块级标签
+_SPACE_TOKEN_RE = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>"
+    r"|<!--.*?-->"
+    r"|</?(?:" + "|".join(_BLOCK_TAGS) + r")\b[^>]*>",
+    re.IGNORECASE | re.DOTALL
+)
+# 直接删除: 其他标签、声明/处理指令
+_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>|<[!?][^>]*>")
+# 定位截断点时使用的标记 (任意标签或注释)
+_MARKUP_RE = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->|</?[a-zA-Z!?][^>]*>",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _convert(html_text: str) -> str:
+    text = _SPACE_TOKEN_RE.sub(" ", html_text)
+    text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = unescape(text)
+    # split/join 合并空白比正则替换快得多
+    return " ".join(text.split())
+
+
+def _cut_position(html_text: str, max_chars: int) -> int:
+    """估计产出 max_chars 个字符所需的原文长度，只在标记边界处截断"""
+    # 实体和连续空白会变短，按1.5倍预留
+    budget = max_chars + max_chars // 2
+    visible = 0
+    pos = 0
+    for match in _MARKUP_RE.finditer(html_text):
+        visible += match.start() - pos
+        if visible >= budget:
+            return match.start()
+        pos = match.end()
+    return len(html_text)
+
+
+def html_to_text(html_text: str, max_chars: Optional[int] = None) -> str:
+    """
+    HTML转纯文本
+    max_chars: 结果长度上限，超出部分不做处理
+    """
+    if not html_text:
+        return ""
+
+    if max_chars is None or len(html_text) <= max_chars:
+        text = _convert(html_text)
+    else:
+        end = _cut_position(html_text, max_chars)
+        text = _convert(html_text[:end])
+        # 估计的前缀不够长时退回处理全文
+        if len(text) < max_chars and end < len(html_text):
+            text = _convert(html_text)
+
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars].rstrip()
+    return text
@@ -0,0 +1,122 @@
+"""
+HTTP客户端模块
+抓取和推送共用一个带连接池的会话，复用TCP/TLS连接，临时错误自动重试
+"""
+
+import threading
+from typing import Dict, Optional
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import HTTP_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2为可选功能
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 调用方捕获的请求异常
+if httpx is not None:
+    HTTP_ERRORS = (requests.RequestException, httpx.HTTPError)
+else:
+    HTTP_ERRORS = (requests.RequestException,)
+
+
+class HttpClient:
+    """共享HTTP客户端 - 默认基于requests.Session，可选httpx的HTTP/2"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = config or HTTP_CONFIG
+        self._httpx = None
+        self._session = None
+
+        if self.config.get("http2"):
+            if httpx is None:
+                logger.warning("未安装httpx，HTTP/2不可用，使用HTTP/1.1")
+            else:
+                self._httpx = self._build_httpx()
+
+        if self._httpx is None:
+            self._session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.config.get("retries", 3),
+            backoff_factor=self.config.get("backoff_factor", 0.5),
+            status_forcelist=self.config.get("status_forcelist", [500, 502, 503, 504]),
+            # 读超时不重试，否则会拖过抓取总时限
+            read=0,
+            # 不按服务器的 Retry-After 等待 (没有上限，会拖过抓取总时限)，
+            # 限流由调用方处理: 抓取交给 SourceScheduler 退避，飞书分发自行按上限等待
+            respect_retry_after_header=False,
+            # 重试用尽时返回最后一次响应，由调用方判断状态码
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.config.get("pool_connections", 16),
+            pool_maxsize=self.config.get("pool_maxsize", 4),
+            max_retries=retry,
+            # 连接数达到上限时等待，而不是新建连接
+            pool_block=True,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _build_httpx(self):
+        limits = httpx.Limits(
+            max_connections=self.config.get("pool_connections", 16) * self.config.get("pool_maxsize", 4),
+            max_keepalive_connections=self.config.get("pool_connections", 16),
+        )
+        try:
+            # httpx的传输层只重试连接失败
+            transport = httpx.HTTPTransport(
+                http2=True,
+                retries=self.config.get("retries", 3),
+                limits=limits,
+            )
+            return httpx.Client(http2=True, transport=transport, follow_redirects=True)
+        except ImportError:
+            logger.warning("未安装h2，HTTP/2不可用，使用HTTP/1.1")
+            return None
+
+    def get(self, url: str, **kwargs):
+        """GET请求"""
+        if self._httpx is not None:
+            return self._httpx.get(url, **kwargs)
+        return self._session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """POST请求"""
+        if self._httpx is not None:
+            # httpx中原始请求体使用content参数
+            if isinstance(kwargs.get("data"), (str, bytes)):
+                kwargs["content"] = kwargs.pop("data")
+            return self._httpx.post(url, **kwargs)
+        return self._session.post(url, **kwargs)
+
+    def close(self):
+        if self._httpx is not None:
+            self._httpx.close()
+        if self._session is not None:
+            self._session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """获取共享的HTTP客户端"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,138 @@
+"""
+日内增量推送状态
+记录当天已推送新闻 (早报和突发新闻) 的MinHash签名，突发新闻轮询只推送与它们都不相似的新条目，
+避免其他媒体稍后转载的同一条新闻被再次推送。
+不按发布时间截断: feed中的条目常带有较早的时间戳，早报之后才出现的新闻同样是增量。
+签名按天保存在 INTRADAY["path"]，每次轮询直接载入，不重新计算，日期变化后自动清空
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+from config import DEDUP_CONFIG, INTRADAY
+from dates import LOCAL_TZ
+from near_dup import NearDuplicateIndex, cluster_members
+
+logger = logging.getLogger(__name__)
+
+
+def _today() -> str:
+    return datetime.now(LOCAL_TZ).date().isoformat()
+
+
+class IntradayState:
+    """当天已推送新闻的相似度索引"""
+
+    def __init__(self, path: str, dedup_options: Optional[Dict] = None):
+        self.path = path
+        options = DEDUP_CONFIG if dedup_options is None else dedup_options
+        self.options = {k: v for k, v in options.items() if k != "near_duplicate"}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _reset(self):
+        self.day = _today()
+        self.pushed = []
+        self.index = NearDuplicateIndex(**self.options)
+
+    def _load(self):
+        self._reset()
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"读取日内推送状态失败: {str(e)}")
+            return
+
+        # 跨天或去重参数变化后签名不再可用
+        if data.get("day") != self.day or data.get("options") != self.options:
+            logger.info("日内推送状态已过期，重新开始记录")
+            return
+        for item in data.get("items", []):
+            self.index.add(item, tuple(item["signature"]))
+            self.pushed.append(item)
+
+    def _roll_over(self):
+        """常驻进程跨过零点后从空状态开始"""
+        if self.day != _today():
+            self._reset()
+
+    def is_new(self, news: Dict) -> bool:
+        """
+        是否属于当天的增量: 与当天已推送的新闻都不相似
+        (不修改状态，推送成功后再调用 record)
+        """
+        with self._lock:
+            self._roll_over()
+            signature = self.index.signature(news)
+            return signature is None or self.index.find(signature) is None
+
+    def new_items(self, news_list: List[Dict]) -> List[Dict]:
+        """当天的增量 (见 is_new)"""
+        return [news for news in news_list if self.is_new(news)]
+
+    def record(self, news_list: List[Dict]):
+        """记录已推送的新闻并写回磁盘"""
+        with self._lock:
+            self._roll_over()
+            pushed_at = datetime.now(LOCAL_TZ).strftime("%H:%M")
+            # 合并过的其他转载也记录下来，与代表新闻不够相似的改写稿之后同样不再推送
+            for news in (member for pushed in news_list for member in cluster_members(pushed)):
+                signature = self.index.signature(news)
+                # 与已推送新闻相似的不重复记录
+                if signature is None or self.index.find(signature) is not None:
+                    continue
+                item = {
+                    "title": news.get("title", ""),
+                    "link": news.get("link", ""),
+                    "source": news.get("source", ""),
+                    "pushed_at": pushed_at,
+                    "signature": list(signature),
+                }
+                self.index.add(item, signature)
+                self.pushed.append(item)
+            data = json.dumps(
+                {"day": self.day, "options": self.options, "items": self.pushed},
+                ensure_ascii=False
+            )
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"写入日内推送状态失败: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self.pushed)
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_intraday_state() -> Optional[IntradayState]:
+    """获取共享的日内推送状态 (常驻模式下跨轮询保留在内存中)，未启用时返回None"""
+    global _state
+    if not INTRADAY.get("enabled"):
+        return None
+
+    with _state_lock:
+        if _state is None:
+            _state = IntradayState(INTRADAY["path"])
+        return _state
+
+
+def record_pushed(news_list: List[Dict]):
+    """记录已推送的新闻的便捷函数 (未启用时忽略)"""
+    state = get_intraday_state()
+    if state is not None and news_list:
+        state.record(news_list)
@@ -1,15 +1,33 @@
 """
 欧洲汽车新闻早报 - 主程序入口
 每日自动抓取欧洲汽车新闻并推送
+
+用法:
+    python main.py                  # 运行一次早报
+    python main.py --job breaking   # 运行一次突发新闻轮询
+    python main.py --daemon         # 常驻运行，按 config.SCHEDULES 定时执行
 """
 
+import argparse
+import os
+import signal
 import sys
 import logging
 from datetime import datetime
+from typing import List, Optional
 
 from fetcher import fetch_news
 from processor import process_news
 from notifier import send_notification
+from seen_index import get_seen_index, mark_delivered
+from intraday import get_intraday_state, record_pushed
+from metrics import RunMetrics
+from matcher import KeywordMatcher
+from models import match_text
+from http_client import get_http_client
+from parse_pool import get_parse_pool
+from scheduler import SCHEDULE_TZ, Schedule, Scheduler
+from config import INTRADAY, METRICS_CONFIG, SCHEDULES
 
 # 配置日志
 logging.basicConfig(
@@ -27,10 +45,12 @@ def main():
     logger.info(f"开始时间: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("=" * 50)
 
+    metrics = RunMetrics()
+
     try:
         # 1. 抓取新闻
         logger.info("\n📥 Step 1: 抓取新闻...")
-        news_list = fetch_news()
+        news_list = fetch_news(metrics)
         logger.info(f"   共获取 {len(news_list)} 条新闻")
 
         if not news_list:
@@ -38,21 +58,22 @@ def main():
 
         # 2. 处理新闻
         logger.info("\n📝 Step 2: 处理新闻...")
-        processed = process_news(news_list)
+        processed = process_news(news_list, metrics)
         logger.info(f"   处理完成，共 {processed['news_count']} 条")
 
         # 3. 打印Markdown预览
         logger.info("\n📄 早报预览:")
         logger.info("-" * 50)
-        # 只打印前3条预览
-        preview_lines = processed["markdown"].split('\n')[:20]
+        # 只打印前3条预览，各推送格式在发送时按需生成
+        preview_lines = processed.preview_markdown(3).split('\n')[:20]
         for line in preview_lines:
             logger.info(f"   {line}")
         logger.info("   ...")
 
         # 4. 发送通知
         logger.info("\n📤 Step 3: 发送通知...")
-        results = send_notification(processed)
+        with metrics.timer("send"):
+            results = send_notification(processed)
 
         # 5. 输出结果
         logger.info("\n" + "=" * 50)
@@ -63,10 +84,15 @@ def main():
             logger.info("   ✅ 邮件推送成功")
         if not any(results.values()):
             logger.warning("   ⚠️ 未配置任何推送渠道")
+        else:
+            # 记录已推送的新闻，之后的运行不再重复推送
+            mark_delivered(news_list)
+            record_pushed(news_list)
 
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         logger.info(f"\n⏱️ 总耗时: {duration:.1f}秒")
+        metrics.log_summary()
         logger.info("✅ 执行完成!")
         logger.info("=" * 50)
 
@@ -78,7 +104,145 @@ def main():
         logger.error(traceback.format_exc())
         return False
 
+    finally:
+        _export_metrics(metrics)
+
+
+def breaking_news(keywords: Optional[List[str]] = None) -> bool:
+    """
+    突发新闻轮询 - 只推送增量: 尚未推送过、与当天已推送的新闻不相似且命中关键词的新闻，
+    没有新内容时不推送；keywords为空时推送所有新的相关新闻
+    未到轮询时间的源使用缓存 (SOURCE_SCHEDULE)，已推送过的条目在解析前就被跳过
+    """
+    if get_seen_index() is None:
+        logger.warning("突发新闻轮询依赖已推送索引 (SEEN_INDEX)，未启用时跳过")
+        return False
+
+    metrics = RunMetrics()
+    try:
+        # 关键词和日内增量在取前K条之前筛选，否则前K条被已推送或不相关的新闻占满时，真正的增量会被截掉
+        predicates = {}
+        matcher = KeywordMatcher(keywords or [])
+        if matcher:
+            predicates["keyword"] = lambda news: bool(matcher.search(match_text(news)))
+        # 其他媒体稍后转载的、当天已推送过的新闻
+        intraday = get_intraday_state()
+        if intraday is not None:
+            predicates["intraday"] = intraday.is_new
+
+        # 已推送过的新闻在抓取时就被过滤掉
+        news_list = fetch_news(metrics, predicates)
+
+        if not news_list:
+            logger.info("没有新的突发新闻")
+            return True
+
+        logger.info(f"发现 {len(news_list)} 条突发新闻")
+        processed = process_news(news_list, metrics, title="欧洲汽车快讯", compact=INTRADAY.get("compact", False))
+        with metrics.timer("send"):
+            results = send_notification(processed)
+
+        if not any(results.values()):
+            logger.warning("突发新闻推送失败")
+            return False
+        mark_delivered(news_list)
+        record_pushed(news_list)
+        return True
+
+    except Exception as e:
+        logger.error(f"突发新闻轮询失败: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+
+    finally:
+        _export_metrics(metrics, "breaking")
+
+
+def _export_metrics(metrics: RunMetrics, job: Optional[str] = None):
+    """写出运行指标，早报以外的任务写到各自的子目录"""
+    metrics.finish()
+    if METRICS_CONFIG.get("enabled"):
+        directory = METRICS_CONFIG["dir"]
+        metrics.export(os.path.join(directory, job) if job else directory)
+
+
+def scheduled_digest() -> bool:
+    """常驻模式下的早报 - 顺便清理过期的推送记录"""
+    index = get_seen_index()
+    if index is not None:
+        index.purge_expired()
+    return main()
+
+
+JOBS = {
+    "digest": scheduled_digest,
+    "breaking": breaking_news,
+}
+
+
+def run_job(job: str) -> bool:
+    """
+    单次运行一个任务 (由外部定时器如GitHub Actions触发)
+    与常驻模式一致: 使用 SCHEDULES 中该任务的配置项，未启用或不在 active_hours 时段内时跳过
+    """
+    if job == "digest":
+        return main()
+
+    specs = [spec for spec in SCHEDULES if spec["job"] == job]
+    enabled = [spec for spec in specs if spec.get("enabled", True)]
+    if specs and not enabled:
+        logger.info(f"任务 {job} 未启用 (config.SCHEDULES)，跳过")
+        return True
+    if not enabled:
+        return JOBS[job]()
+
+    schedule = Schedule(enabled[0])
+    if not schedule.is_active(datetime.now(SCHEDULE_TZ)):
+        logger.info(f"任务 {job} 不在运行时段 {schedule.active_hours} 内，跳过")
+        return True
+    return JOBS[job](**schedule.options)
+
+
+def run_daemon():
+    """
+    常驻运行
+    HTTP连接池、SMTP连接池、已推送索引和条目片段缓存都是进程内共享的，
+    在多次任务之间保持，启动和导入的开销只有一次
+    """
+    scheduler = Scheduler(JOBS)
+
+    def handle_signal(signum, frame):
+        logger.info(f"收到信号 {signum}，当前任务完成后退出")
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    # 提前建立共享资源，配置错误在启动时就能发现
+    get_http_client()
+    get_seen_index()
+    get_intraday_state()
+    parse_pool = get_parse_pool()
+    if parse_pool is not None:
+        parse_pool.warm_up()
+
+    logger.info("🚗 欧洲汽车新闻早报常驻模式启动")
+    scheduler.run_forever()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="欧洲汽车新闻早报")
+    parser.add_argument("--daemon", action="store_true", help="常驻运行，按 config.SCHEDULES 定时执行")
+    parser.add_argument("--job", choices=sorted(JOBS), default="digest", help="单次运行的任务 (默认: digest)")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    success = main()
+    args = parse_args()
+    if args.daemon:
+        run_daemon()
+        sys.exit(0)
+
+    success = run_job(args.job)
     sys.exit(0 if success else 1)
@@ -0,0 +1,61 @@
+"""
+关键词匹配模块
+把关键词列表预编译成一个正则，按词首匹配 (允许词尾变化，短缩写按完整的词)，并返回命中的关键词
+"""
+
+import re
+from typing import Iterable, Set
+
+
+class KeywordMatcher:
+    """预编译的多关键词匹配器 - 每次运行构建一次，对每段文本只扫描一遍"""
+
+    def __init__(self, keywords: Iterable[str]):
+        # 小写形式 -> 配置中的原始写法
+        self._canonical = {}
+        for kw in keywords:
+            kw = kw.strip()
+            if kw:
+                self._canonical.setdefault(kw.lower(), kw)
+
+        self.keywords = list(self._canonical.values())
+        self._regex = self._compile(self._canonical) if self._canonical else None
+
+    @staticmethod
+    def _is_acronym(keyword: str) -> bool:
+        """EV、VW、OEM这类短缩写 - 只允许复数s，避免 "EV" 命中 "every" """
+        return len(keyword) <= 3 or keyword.isupper()
+
+    @classmethod
+    def _alternative(cls, keyword: str) -> str:
+        parts = [re.escape(part) for part in keyword.split()]
+        if cls._is_acronym(keyword):
+            return r"\s+".join(parts) + r"s?(?!\w)"
+        # 普通词按词首匹配，允许词尾变化: launch -> launched/launches，review -> reviewed；
+        # 以y结尾的词同时匹配 -ies 形式: battery -> batteries
+        last = parts[-1]
+        if last.lower().endswith("y") and len(last) > 2:
+            parts[-1] = last[:-1] + "[yi]"
+        return r"\s+".join(parts) + r"\w*"
+
+    def _compile(self, keywords) -> "re.Pattern":
+        # 长的在前，保证 "European" 优先于 "Europe"；每个关键词一个分组，按分组编号还原命中的关键词
+        self._ordered = sorted(keywords, key=len, reverse=True)
+        alternatives = [f"({self._alternative(self._canonical[kw])})" for kw in self._ordered]
+        return re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+
+    def __bool__(self) -> bool:
+        return self._regex is not None
+
+    def search(self, text: str) -> bool:
+        """文本中是否包含任一关键词"""
+        return self._regex is not None and self._regex.search(text) is not None
+
+    def find(self, text: str) -> Set[str]:
+        """返回文本中命中的全部关键词 (配置中的原始写法)"""
+        if self._regex is None:
+            return set()
+        return {
+            self._canonical[self._ordered[m.lastindex - 1]]
+            for m in self._regex.finditer(text)
+        }
@@ -0,0 +1,169 @@
+"""
+运行指标模块
+记录每个阶段/每个源的耗时、各阶段丢弃的条目数和下载字节数，
+导出为JSON运行报告和Prometheus文本格式
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 流程中的阶段，按执行顺序
+STAGES = ("fetch", "parse", "clean", "dedup", "filter", "sort", "render", "send")
+
+
+def _escape_label(value: str) -> str:
+    """Prometheus标签值转义"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunMetrics:
+    """单次运行的指标 - 抓取在多个线程中进行，所有写操作加锁"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.duration = None
+        self.stages = {}
+        self.sources = {}
+        self.dropped = {}
+        self.counters = {}
+
+    @contextmanager
+    def timer(self, stage: str, source: Optional[str] = None):
+        """计时上下文"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start, source)
+
+    def add_time(self, stage: str, seconds: float, source: Optional[str] = None):
+        """累加阶段耗时，指定source时同时计入该源"""
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+            if source is not None:
+                timings = self._source(source).setdefault("seconds", {})
+                timings[stage] = timings.get(stage, 0.0) + seconds
+
+    def count_dropped(self, stage: str, count: int = 1):
+        """记录某阶段丢弃的条目数"""
+        if count:
+            with self._lock:
+                self.dropped[stage] = self.dropped.get(stage, 0) + count
+
+    def incr(self, name: str, count: int = 1):
+        """通用计数"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + count
+
+    def record_source(self, source: str, **fields):
+        """记录源的结果 (bytes/items/status等)，数值字段累加"""
+        with self._lock:
+            entry = self._source(source)
+            for key, value in fields.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry[key] = entry.get(key, 0) + value
+                else:
+                    entry[key] = value
+
+    def _source(self, source: str) -> Dict:
+        return self.sources.setdefault(source, {})
+
+    def finish(self):
+        """结束计时"""
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            stages = {s: dict(self.stages[s]) for s in STAGES if s in self.stages}
+            stages.update({s: dict(v) for s, v in self.stages.items() if s not in stages})
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_seconds": self.duration,
+                "stages": stages,
+                "dropped": dict(self.dropped),
+                "counters": dict(self.counters),
+                "sources": copy.deepcopy(self.sources),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix: str = "euro_news") -> str:
+        """Prometheus文本格式 (可用于node_exporter的textfile收集器)"""
+        data = self.to_dict()
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                label_str = f"{{{label_str}}}" if label_str else ""
+                lines.append(f"{prefix}_{name}{label_str} {value}")
+
+        metric("run_timestamp_seconds", "Run start time",
+               [({}, int(self.started_at.timestamp()))])
+        if data["duration_seconds"] is not None:
+            metric("run_duration_seconds", "Total run time",
+                   [({}, round(data["duration_seconds"], 6))])
+        metric("stage_seconds", "Time spent in each pipeline stage",
+               [({"stage": s}, round(v["seconds"], 6)) for s, v in data["stages"].items()])
+        metric("dropped_items", "Items dropped at each stage",
+               [({"stage": s}, v) for s, v in data["dropped"].items()])
+        metric("count", "Run counters",
+               [({"name": k}, v) for k, v in data["counters"].items()])
+        metric("source_seconds", "Time spent per source and stage",
+               [({"source": name, "stage": stage}, round(seconds, 6))
+                for name, src in data["sources"].items()
+                for stage, seconds in src.get("seconds", {}).items()])
+        metric("source_bytes", "Bytes downloaded per source",
+               [({"source": name}, src.get("bytes", 0)) for name, src in data["sources"].items()])
+        metric("source_items", "Items parsed per source",
+               [({"source": name}, src.get("items", 0)) for name, src in data["sources"].items()])
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: str):
+        """写出 run_report.json 和 metrics.prom"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for filename, content in (("run_report.json", self.to_json()),
+                                      ("metrics.prom", self.to_prometheus())):
+                path = os.path.join(directory, filename)
+                with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(f"{path}.tmp", path)
+            logger.info(f"运行指标已写入: {directory}")
+        except OSError as e:
+            logger.error(f"写入运行指标失败: {str(e)}")
+
+    def log_summary(self):
+        """在日志中输出各阶段耗时和最慢的源"""
+        data = self.to_dict()
+        for stage, value in data["stages"].items():
+            logger.info(f"   {stage:<8} {value['seconds']:.3f}s")
+        if data["dropped"]:
+            dropped = ", ".join(f"{k}={v}" for k, v in data["dropped"].items())
+            logger.info(f"   丢弃: {dropped}")
+
+        slowest = sorted(
+            data["sources"].items(),
+            key=lambda kv: sum(kv[1].get("seconds", {}).values()),
+            reverse=True
+        )[:3]
+        for name, src in slowest:
+            seconds = sum(src.get("seconds", {}).values())
+            logger.info(f"   最慢源: {name} {seconds:.2f}s, {src.get('bytes', 0) / 1024:.0f}KB")
@@ -0,0 +1,133 @@
+"""
+新闻条目模块
+NewsItem 用 __slots__ 保存条目字段，比每条一个字典占用更少内存、属性访问更快；
+同时提供字典式的读写接口 (item["title"] / item.get("summary"))，原来按字典使用的代码不需要修改
+"""
+
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from dates import format_relative, now_utc
+
+# 相对日期 (今天/昨天) 的参考时间，每次运行设置一次；未设置时使用当前时间
+_reference_time = None
+
+
+def set_reference_time(now: Optional[datetime]):
+    """设置相对日期的参考时间"""
+    global _reference_time
+    _reference_time = now
+
+
+class NewsItem:
+    """
+    新闻条目
+    published_str 在首次使用时按参考时间生成；match_text 为关键词匹配用的标题+摘要，首次使用时生成并缓存
+    (条目创建后标题和摘要不再修改)
+    """
+
+    # 可以按字典键访问的数据字段
+    FIELDS = ("title", "link", "summary", "source", "published",
+              "keyword_hits", "cluster_size", "other_sources", "merged_items", "score")
+
+    __slots__ = FIELDS + ("_published_str", "_match_text")
+
+    def __init__(self, title: str, link: str, summary: str = "", source: str = "",
+                 published: Optional[datetime] = None, keyword_hits: Optional[List[str]] = None,
+                 cluster_size: int = 1, other_sources: Optional[List[str]] = None,
+                 merged_items: Optional[List[Dict]] = None, score: Optional[float] = None):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        # 来源名称在大量条目间重复，驻留后只保存一份
+        self.source = sys.intern(source) if source else ""
+        self.published = published
+        self.keyword_hits = keyword_hits
+        self.cluster_size = cluster_size
+        self.other_sources = other_sources
+        # 合并进来的其他转载 (链接、标题、摘要)，推送后一并记为已推送
+        self.merged_items = merged_items
+        self.score = score
+        self._published_str = None
+        self._match_text = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NewsItem":
+        """从字典创建 (忽略未知字段和 published_str)"""
+        return cls(**{k: v for k, v in data.items() if k in cls.FIELDS and v is not None})
+
+    @property
+    def published_str(self) -> str:
+        if self._published_str is None:
+            now = _reference_time or now_utc()
+            self._published_str = format_relative(self.published, now)
+        return self._published_str
+
+    @property
+    def match_text(self) -> str:
+        if self._match_text is None:
+            self._match_text = f"{self.title} {self.summary}"
+        return self._match_text
+
+    # ---------- 字典接口 ----------
+
+    def __getitem__(self, key: str):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if key == "published_str":
+            return self.published_str
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key == "published_str":
+            self._published_str = value
+        elif key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        """与 dict.get 一致 - 未设置 (None) 的字段返回default"""
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def setdefault(self, key: str, default=None):
+        value = self.get(key)
+        if value is None:
+            self[key] = default
+            value = default
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self) -> List[str]:
+        """已设置的数据字段 (不含派生的 published_str)"""
+        return [key for key in self.FIELDS if getattr(self, key) is not None]
+
+    def items(self) -> Iterator[tuple]:
+        for key in self.keys():
+            yield key, getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def to_dict(self) -> Dict:
+        """转为普通字典 (含 published_str)"""
+        data = dict(self.items())
+        data["published_str"] = self.published_str
+        return data
+
+    def __repr__(self) -> str:
+        return f"<NewsItem {self.source}: {self.title[:40]!r}>"
+
+
+def match_text(news) -> str:
+    """关键词匹配用的文本，NewsItem使用缓存，普通字典临时拼接"""
+    if isinstance(news, NewsItem):
+        return news.match_text
+    return f"{news.get('title', '')} {news.get('summary', '')}"
@@ -0,0 +1,137 @@
+"""
+相似新闻合并模块
+基于MinHash签名和LSH分桶找出不同媒体转载的同一条新闻，
+每组只保留一条代表新闻，并记录其他来源
+"""
+
+import hashlib
+import random
+import re
+from typing import List, Dict, Optional, Tuple
+
+# Mersenne素数 2^61-1，用于MinHash的线性哈希
+_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class NearDuplicateIndex:
+    """
+    增量式近似去重索引 - 逐条加入，代价与已有新闻数量无关
+    每组保存签名和代表新闻的引用 (之后的转载要合并到代表新闻上)，内存随不同新闻的数量增长
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 2, summary_chars: int = 200, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm必须能被bands整除")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.summary_chars = summary_chars
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = []
+        self._items = []
+
+    def _shingles(self, item: Dict) -> set:
+        """标题+摘要按词切片"""
+        text = f"{item.get('title', '')} {item.get('summary', '')[:self.summary_chars]}"
+        words = _WORD_RE.findall(text.lower())
+        k = self.shingle_size
+        if len(words) <= k:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+    def signature(self, item: Dict) -> Optional[Tuple[int, ...]]:
+        """计算MinHash签名"""
+        shingles = self._shingles(item)
+        if not shingles:
+            return None
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+            for s in shingles
+        ]
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        r = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * r:(band + 1) * r]
+
+    def _similarity(self, sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """由签名估计Jaccard相似度"""
+        same = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+        return same / self.num_perm
+
+    def find(self, signature: Tuple[int, ...]) -> Optional[Dict]:
+        """与签名最相似 (且超过阈值) 的已有代表新闻，不修改索引"""
+        # 只和同一分桶中的候选比较
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best, best_score = None, self.threshold
+        for index in candidates:
+            score = self._similarity(signature, self._signatures[index])
+            if score >= best_score:
+                best, best_score = index, score
+        return self._items[best] if best is not None else None
+
+    def add(self, item: Dict, signature: Optional[Tuple[int, ...]] = None) -> Optional[Dict]:
+        """
+        加入一条新闻 (signature为预先计算好的签名)
+        与已有新闻相似时合并到该组并返回代表新闻，否则作为新代表并返回None
+        """
+        if signature is None:
+            signature = self.signature(item)
+        if signature is None:
+            return None
+
+        representative = self.find(signature)
+        if representative is not None:
+            self._merge(representative, item)
+            return representative
+
+        index = len(self._items)
+        self._items.append(item)
+        self._signatures.append(signature)
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(index)
+        return None
+
+    @staticmethod
+    def _merge(representative: Dict, item: Dict):
+        """把重复新闻的来源和链接记到代表新闻上"""
+        representative["cluster_size"] = representative.get("cluster_size", 1) + 1
+        source = item.get("source")
+        others = representative.setdefault("other_sources", [])
+        if source and source != representative.get("source") and source not in others:
+            others.append(source)
+        representative.setdefault("merged_items", []).append({
+            "link": item.get("link", ""),
+            "title": item.get("title", ""),
+            "summary": item.get("summary", ""),
+        })
+
+
+def cluster_members(news: Dict) -> List[Dict]:
+    """代表新闻及合并到它上面的其他转载 (记录已推送时使用)"""
+    return [news, *news.get("merged_items", ())]
+
+
+def cluster_near_duplicates(news_list: List[Dict], **options) -> List[Dict]:
+    """合并相似新闻的便捷函数 - 保留每组中最先出现的一条"""
+    index = NearDuplicateIndex(**options)
+    return [news for news in news_list if index.add(news) is None]
@@ -3,15 +3,19 @@
 支持飞书群机器人和邮件推送
 """
 
-import json
-import smtplib
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, List
 import logging
 
-from config import FEISHU_WEBHOOK, EMAIL_CONFIG
+from config import FEISHU_WEBHOOK, FEISHU_TARGETS, EMAIL_CONFIG, NOTIFY_CONFIG
+from feishu_fanout import FeishuFanout
+from http_client import get_http_client
+from processor import serialize_card
+from smtp_pool import get_smtp_pool
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -21,50 +25,135 @@ logger = logging.getLogger(__name__)
 class Notifier:
     """消息推送器"""
 
+    # 各渠道需要的内容格式
+    CHANNEL_FORMATS = {
+        "feishu": ("feishu_cards",),
+        "email": ("html",),
+    }
+
     def __init__(self):
         self.feishu_webhook = FEISHU_WEBHOOK
+        self.feishu_targets = FEISHU_TARGETS
         self.email_config = EMAIL_CONFIG
+        self.http = get_http_client()
+        self.channel_timeout = NOTIFY_CONFIG.get("channel_timeout", {})
+        # 最近一次send_all的明细: 渠道 -> {success, seconds, error}
+        self.report = {}
+        # 最近一次多群推送的逐群报告
+        self.feishu_report = []
+
+    def enabled_channels(self) -> List[str]:
+        """已配置的推送渠道"""
+        channels = []
+        if self.feishu_webhook or self.feishu_targets:
+            channels.append("feishu")
+        if self.email_config.get("enabled"):
+            channels.append("email")
+        return channels
+
+    def required_formats(self) -> List[str]:
+        """已配置渠道需要的内容格式"""
+        formats = []
+        for channel in self.enabled_channels():
+            for fmt in self.CHANNEL_FORMATS[channel]:
+                if fmt not in formats:
+                    formats.append(fmt)
+        return formats
 
     def send_all(self, processed_news: dict) -> Dict[str, bool]:
-        """发送消息到所有配置的渠道"""
-        results = {}
-
-        # 飞书推送
-        if self.feishu_webhook:
-            results["feishu"] = self.send_feishu(processed_news["feishu_card"])
-        else:
-            results["feishu"] = False
+        """
+        并发发送到所有配置的渠道
+        每次请求都有各自的超时且重试次数有限，所以渠道总会结束；多张卡片或多个群可能超过
+        channel_timeout，此时记录警告并等待发送完成，按实际结果报告 (否则已送达的早报会被记为失败，
+        也不会写入已推送记录)
+        """
+        channels = self.enabled_channels()
+        results = {"feishu": False, "email": False}
+        self.report = {}
+
+        if not channels:
+            return results
+
+        # 只生成用得到的格式，且在分发前生成，避免多个线程同时渲染
+        if hasattr(processed_news, "prepare"):
+            processed_news.prepare(self.required_formats())
+
+        senders = {
+            "feishu": lambda: self.send_feishu_targets(processed_news) if self.feishu_targets
+            else self.send_feishu(processed_news["feishu_cards"]),
+            "email": lambda: self.send_email(processed_news["html"], processed_news["date"]),
+        }
+
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(channels), thread_name_prefix="notifier")
+        futures = {channel: executor.submit(self._timed, senders[channel]) for channel in channels}
 
-        # 邮件推送
-        if self.email_config.get("enabled"):
-            results["email"] = self.send_email(
-                processed_news["html"],
-                processed_news["date"]
-            )
-        else:
-            results["email"] = False
+        try:
+            for channel, future in futures.items():
+                timeout = self.channel_timeout.get(channel, 60)
+                deadline = start + timeout
+                try:
+                    try:
+                        success, seconds = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    except FuturesTimeoutError:
+                        logger.warning(f"{channel} 推送已超过 {timeout} 秒，等待发送完成")
+                        success, seconds = future.result()
+                    self.report[channel] = {"success": success, "seconds": round(seconds, 3)}
+                except Exception as e:
+                    success = False
+                    logger.error(f"{channel} 推送异常: {str(e)}")
+                    self.report[channel] = {"success": False, "error": str(e)}
+                results[channel] = success
+
+            if self.feishu_report and "feishu" in self.report:
+                self.report["feishu"]["targets"] = self.feishu_report
+        finally:
+            executor.shutdown(wait=False)
 
         return results
 
-    def send_feishu(self, card_data: dict) -> bool:
-        """发送飞书卡片消息"""
+    @staticmethod
+    def _timed(func):
+        start = time.monotonic()
+        success = func()
+        return success, time.monotonic() - start
+
+    def send_feishu(self, card_data) -> bool:
+        """
+        发送飞书卡片消息
+        card_data可以是单张卡片或拆分后的卡片列表，列表按顺序在同一连接上依次发送，
+        某一张失败时停止，避免群里出现缺页的早报
+        """
         if not self.feishu_webhook:
             logger.warning("未配置飞书Webhook")
             return False
 
+        cards = card_data if isinstance(card_data, list) else [card_data]
+        for index, card in enumerate(cards, 1):
+            if not self._post_feishu_card(card):
+                if len(cards) > 1:
+                    logger.error(f"飞书消息在第 {index}/{len(cards)} 张卡片处中断")
+                return False
+
+        if len(cards) > 1:
+            logger.info(f"飞书消息发送成功 (共 {len(cards)} 张卡片)")
+        else:
+            logger.info("飞书消息发送成功")
+        return True
+
+    def _post_feishu_card(self, card: dict) -> bool:
         try:
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(
+            headers = {"Content-Type": "application/json; charset=utf-8"}
+            response = self.http.post(
                 self.feishu_webhook,
                 headers=headers,
-                data=json.dumps(card_data),
-                timeout=30
+                data=serialize_card(card),
+                timeout=self.channel_timeout.get("feishu", 30)
             )
 
             if response.status_code == 200:
                 result = response.json()
                 if result.get("code") == 0:
-                    logger.info("飞书消息发送成功")
                     return True
                 else:
                     logger.error(f"飞书返回错误: {result}")
@@ -77,6 +166,12 @@ class Notifier:
             logger.error(f"飞书发送失败: {str(e)}")
             return False
 
+    def send_feishu_targets(self, processed_news) -> bool:
+        """推送到 FEISHU_TARGETS 中的多个群，至少一个群成功即视为成功"""
+        fanout = FeishuFanout(self.feishu_targets, timeout=self.channel_timeout.get("feishu", 30))
+        self.feishu_report = fanout.deliver(processed_news)
+        return any(r["success"] for r in self.feishu_report)
+
     def send_email(self, html_content: str, date_str: str) -> bool:
         """发送邮件"""
         config = self.email_config
@@ -96,22 +191,17 @@ class Notifier:
             html_part = MIMEText(html_content, 'html', 'utf-8')
             msg.attach(html_part)
 
-            # 连接SMTP服务器并发送
-            server = smtplib.SMTP(
-                config.get("smtp_server"),
-                config.get("smtp_port", 587)
-            )
-            server.starttls()
-            server.login(
-                config.get("smtp_user"),
-                config.get("smtp_password")
+            # 通过连接池发送，已登录的连接在多次发送之间复用
+            pool = get_smtp_pool(
+                config,
+                size=NOTIFY_CONFIG.get("smtp_pool_size", 2),
+                timeout=self.channel_timeout.get("email", 60)
             )
-            server.sendmail(
+            pool.send(
                 config.get("smtp_user"),
                 config.get("to_emails", []),
                 msg.as_string()
             )
-            server.quit()
 
             logger.info("邮件发送成功")
             return True
@@ -0,0 +1,150 @@
+"""
+多进程解析模块
+feedparser解析和HTML清洗是CPU密集的，在抓取线程中执行时受GIL限制只能用到一个核；
+启用后把下载到的原始内容交给进程池解析，子进程只返回紧凑的条目元组。
+进程池在常驻模式下跨多次运行保持
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import fast_feed
+from config import FETCH_CONFIG
+from dates import entry_datetime, install_feedparser_handler
+from html_text import html_to_text
+from source_scheduler import feed_hint
+
+logger = logging.getLogger(__name__)
+
+# 子进程返回的条目: (title, link, summary, published时间戳或None)
+Record = Tuple[str, str, str, Optional[float]]
+
+
+def parse_feed(content: bytes, summary_max_chars: int, fast: bool = False) -> Dict:
+    """
+    (在子进程中) 解析feed并清洗摘要，字段处理与 NewsFetcher.parse_entry 一致
+    fast: 是否先尝试快速解析器 (由主进程的配置决定)
+    返回 records、entries (条目总数)、hint (源声明的更新间隔) 和各步骤耗时
+    """
+    install_feedparser_handler()
+
+    start = time.perf_counter()
+    feed = fast_feed.parse(content, fast)
+    parse_seconds = time.perf_counter() - start
+
+    records: List[Record] = []
+    clean_seconds = 0.0
+    for entry in feed.entries:
+        title = entry.get("title", "").strip()
+        link = entry.get("link", "").strip()
+        if not title or not link:
+            continue
+
+        start = time.perf_counter()
+        if hasattr(entry, "summary"):
+            summary = html_to_text(entry.summary, summary_max_chars)
+        elif hasattr(entry, "description"):
+            summary = html_to_text(entry.description, summary_max_chars)
+        else:
+            summary = ""
+        clean_seconds += time.perf_counter() - start
+
+        published = entry_datetime(entry)
+        records.append((title, link, summary, published.timestamp() if published else None))
+
+    return {
+        "records": records,
+        "entries": len(feed.entries),
+        "hint": feed_hint(feed.feed),
+        "parse_seconds": parse_seconds,
+        "clean_seconds": clean_seconds,
+    }
+
+
+class ParsePool:
+    """解析进程池 - 子进程用spawn启动，避免在有抓取线程时fork"""
+
+    def __init__(self, processes: int, min_bytes: int = 0, timeout: float = 30):
+        self.processes = max(1, processes)
+        self.min_bytes = min_bytes
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"解析进程池已启动: {self.processes} 个进程")
+            return self._executor
+
+    def accepts(self, content: bytes) -> bool:
+        """小于 min_bytes 的feed在本进程解析更快 (省去进程间传输)"""
+        return len(content) >= self.min_bytes
+
+    def parse(self, content: bytes, summary_max_chars: int) -> Dict:
+        executor = self._get_executor()
+        try:
+            future = executor.submit(
+                parse_feed, content, summary_max_chars, FETCH_CONFIG.get("fast_parser", False)
+            )
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            # 子进程异常退出后进程池不可用，下次调用时重建
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def warm_up(self):
+        """提前启动全部子进程 (常驻模式启动时调用)"""
+        executor = self._get_executor()
+        futures = [executor.submit(install_feedparser_handler) for _ in range(self.processes)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """获取共享的解析进程池，FETCH_CONFIG["parse_processes"] 为0时返回None"""
+    global _pool
+    processes = FETCH_CONFIG.get("parse_processes", 0)
+    if processes == "auto":
+        processes = os.cpu_count() or 1
+    if not processes:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(
+                processes,
+                min_bytes=FETCH_CONFIG.get("parse_min_bytes", 0),
+                timeout=FETCH_CONFIG.get("timeout", 30)
+            )
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown()
@@ -3,174 +3,304 @@
 生成早报格式
 """
 
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from string import Template
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
+import json
 
+from config import FEISHU_CARD_CONFIG
+from dates import LOCAL_TZ
 
-class NewsProcessor:
-    """新闻处理器 - 生成早报格式"""
-
-    def __init__(self):
-        self.today = datetime.now().strftime("%Y年%m月%d日")
-
-    def generate_markdown(self, news_list: List[Dict]) -> str:
-        """生成Markdown格式早报"""
-        if not news_list:
-            return self._generate_empty_report()
-
-        report = []
-        report.append(f"# 🚗 欧洲汽车早报 - {self.today}")
-        report.append("")
-        report.append(f"**今日要闻 ({len(news_list)}条)**")
-        report.append("")
-
-        for i, item in enumerate(news_list, 1):
-            # 标题
-            report.append(f"### {i}. {item['title']}")
-            report.append("")
-
-            # 来源和时间
-            meta = f"📰 {item['source']} | 🕐 {item['published_str']}"
-            report.append(meta)
-            report.append("")
-
-            # 摘要
-            if item.get("summary"):
-                report.append(f"> {item['summary']}")
-                report.append("")
-
-            # 链接
-            report.append(f"🔗 [查看原文]({item['link']})")
-            report.append("")
-            report.append("---")
-            report.append("")
-
-        # 底部信息
-        report.append("")
-        report.append("---")
-        report.append(f"*数据来源: Automotive News Europe, Autocar, Just Auto等*")
-        report.append(f"*生成时间: {datetime.now().strftime('%H:%M:%S')}*")
 
-        return "\n".join(report)
+# ==================== 模板 ====================
+# 静态部分在导入时构建一次，渲染时只填充变量
 
-    def generate_html(self, news_list: List[Dict]) -> str:
-        """生成HTML格式早报"""
-        if not news_list:
-            return self._generate_empty_report_html()
+_HTML_STYLE = """    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; background: #f5f5f5; }
+        .header { background: linear-gradient(135deg, #1a73e8, #4285f4); color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px; }
+        .header h1 { margin: 0; font-size: 24px; }
+        .header .date { opacity: 0.9; margin-top: 5px; }
+        .news-card { background: white; border-radius: 8px; padding: 20px; margin-bottom: 15px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .news-title { font-size: 18px; font-weight: 600; color: #1a73e8; margin-bottom: 10px; }
+        .news-meta { font-size: 13px; color: #666; margin-bottom: 10px; }
+        .news-summary { font-size: 14px; color: #333; line-height: 1.6; }
+        .news-link { display: inline-block; margin-top: 10px; color: #1a73e8; text-decoration: none; }
+        .footer { text-align: center; color: #999; font-size: 12px; margin-top: 20px; }
+    </style>"""
 
-        html_parts = []
-        html_parts.append(f"""<!DOCTYPE html>
+_HTML_HEAD = Template("""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>欧洲汽车早报 - {self.today}</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; background: #f5f5f5; }}
-        .header {{ background: linear-gradient(135deg, #1a73e8, #4285f4); color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px; }}
-        .header h1 {{ margin: 0; font-size: 24px; }}
-        .header .date {{ opacity: 0.9; margin-top: 5px; }}
-        .news-card {{ background: white; border-radius: 8px; padding: 20px; margin-bottom: 15px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .news-title {{ font-size: 18px; font-weight: 6001a73e; color: #8; margin-bottom: 10px; }}
-        .news-meta {{ font-size: 13px; color: #666; margin-bottom: 10px; }}
-        .news-summary {{ font-size: 14px; color: #333; line-height: 1.6; }}
-        .news-link {{ display: inline-block; margin-top: 10px; color: #1a73e8; text-decoration: none; }}
-        .footer {{ text-align: center; color: #999; font-size: 12px; margin-top: 20px; }}
-    </style>
+    <title>$title - $today</title>
+""" + _HTML_STYLE + """
 </head>
 <body>
     <div class="header">
-        <h1>🚗 欧洲汽车早报</h1>
-        <div class="date">{self.today} | 今日要闻 ({len(news_list)}条)</div>
+        <h1>🚗 $title</h1>
+        <div class="date">$today | 今日要闻 ($count条)</div>
     </div>
 """)
 
-        for i, item in enumerate(news_list, 1):
-            html_parts.append(f"""
-    <div class="news-card">
-        <div class="news-title">{i}. {self._escape_html(item['title'])}</div>
-        <div class="news-meta">📰 {self._escape_html(item['source'])} | 🕐 {item['published_str']}</div>
-        <div class="news-summary">{self._escape_html(item.get('summary', ''))}</div>
-        <a class="news-link" href="{self._escape_html(item['link'])}" target="_blank">🔗 查看原文 →</a>
+# 条目模板不含序号，序号在拼接时加在前面
+_HTML_ITEM = Template(""". $title</div>
+        <div class="news-meta">📰 $source | 🕐 $published</div>
+        <div class="news-summary">$summary</div>
+        <a class="news-link" href="$link" target="_blank">🔗 查看原文 →</a>
     </div>
 """)
+_HTML_ITEM_PREFIX = """
+    <div class="news-card">
+        <div class="news-title">"""
 
-        html_parts.append(f"""
+_HTML_FOOTER = Template("""
     <div class="footer">
         <p>数据来源: Automotive News Europe, Autocar, Just Auto等</p>
-        <p>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>生成时间: $time</p>
     </div>
 </body>
 </html>
 """)
 
-        return "\n".join(html_parts)
+_MD_ITEM = Template(". $title\n\n📰 $source | 🕐 $published\n\n$summary🔗 [查看原文]($link)\n\n---\n")
+_FEISHU_ITEM = Template(". $title**\n📰 $source | 🕐 $published\n$summary\n[查看原文]($link)")
+_FEISHU_COMPACT_ITEM = Template(". [$title]($link)** · $source $time")
+
+# 单次遍历的转义表
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+_MD_ESCAPE = str.maketrans({"[": "\\[", "]": "\\]"})
+
+def serialize_card(card: dict) -> bytes:
+    """飞书消息的请求体 - 计算大小和实际发送使用同一种序列化"""
+    return json.dumps(card, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# 条目片段缓存的容量
+FRAGMENT_CACHE_SIZE = 4096
+
+
+class FragmentCache:
+    """条目片段缓存 - 按 (格式, 条目内容) 缓存渲染结果，LRU淘汰"""
+
+    def __init__(self, maxsize: int = FRAGMENT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: tuple, render):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = render()
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# 进程内共享，重新生成只改了少量条目的早报时，未变化的条目直接复用
+_fragment_cache = FragmentCache()
+
+
+class NewsProcessor:
+    """新闻处理器 - 生成早报格式"""
+
+    def __init__(self, fragment_cache: Optional[FragmentCache] = None, title: str = "欧洲汽车早报",
+                 date: Optional[datetime] = None, compact: bool = False):
+        # date: 报告日期，默认为今天 (回放历史时指定)
+        self.today = (date or datetime.now(LOCAL_TZ)).astimezone(LOCAL_TZ).strftime("%Y年%m月%d日")
+        self.title = title
+        # compact: 飞书卡片每条一行 (标题链接、来源和发布时间)，用于日内增量推送
+        self.compact = compact
+        self.fragments = fragment_cache or _fragment_cache
+
+    def _fragment(self, fmt: str, item: Dict, render) -> str:
+        """取条目片段 - 键为渲染用到的全部字段"""
+        key = (
+            fmt,
+            item["title"],
+            item["link"],
+            item["source"],
+            tuple(item.get("other_sources") or ()),
+            item["published_str"],
+            item.get("summary", ""),
+        )
+        return self.fragments.get_or_render(key, lambda: render(item))
+
+    def generate_markdown(self, news_list: List[Dict], total: Optional[int] = None) -> str:
+        """生成Markdown格式早报 (total为标题中显示的条数，只生成前几条预览时传入)"""
+        if not news_list:
+            return self._generate_empty_report()
+
+        parts = [f"# 🚗 {self.title} - {self.today}\n\n**今日要闻 ({total or len(news_list)}条)**\n"]
+        for i, item in enumerate(news_list, 1):
+            parts.append(f"### {i}{self._fragment('markdown', item, self._render_markdown_item)}")
+
+        # 底部信息
+        parts.append(
+            "\n---\n*数据来源: Automotive News Europe, Autocar, Just Auto等*\n"
+            f"*生成时间: {datetime.now(LOCAL_TZ).strftime('%H:%M:%S')}*"
+        )
+        return "\n".join(parts)
+
+    def _render_markdown_item(self, item: Dict) -> str:
+        summary = item.get("summary")
+        return _MD_ITEM.substitute(
+            title=item["title"],
+            source=self._format_source(item),
+            published=item["published_str"],
+            summary=f"> {summary}\n\n" if summary else "",
+            link=item["link"],
+        )
+
+    def generate_html(self, news_list: List[Dict]) -> str:
+        """生成HTML格式早报"""
+        if not news_list:
+            return self._generate_empty_report_html()
+
+        parts = [_HTML_HEAD.substitute(title=self.title, today=self.today, count=len(news_list))]
+        for i, item in enumerate(news_list, 1):
+            parts.append(f"{_HTML_ITEM_PREFIX}{i}{self._fragment('html', item, self._render_html_item)}")
+        parts.append(_HTML_FOOTER.substitute(time=datetime.now(LOCAL_TZ).strftime('%Y-%m-%d %H:%M:%S')))
+
+        return "\n".join(parts)
+
+    def _render_html_item(self, item: Dict) -> str:
+        return _HTML_ITEM.substitute(
+            title=self._escape_html(item["title"]),
+            source=self._escape_html(self._format_source(item)),
+            published=item["published_str"],
+            summary=self._escape_html(item.get("summary", "")),
+            link=self._escape_html(item["link"]),
+        )
 
     def generate_feishu_card(self, news_list: List[Dict]) -> dict:
-        """生成飞书卡片消息格式"""
+        """生成飞书卡片消息格式 (超出大小限制时只返回第一张，完整内容见 generate_feishu_cards)"""
+        return self.generate_feishu_cards(news_list)[0]
+
+    def generate_feishu_cards(self, news_list: List[Dict]) -> List[dict]:
+        """
+        生成飞书卡片消息，按序列化后的大小拆分为多张
+        每张卡片的请求体不超过 FEISHU_CARD_CONFIG["max_bytes"]，元素数不超过 max_elements
+        """
         if not news_list:
-            return self._generate_empty_feishu_card()
-
-        # 构建新闻列表
-        news_elements = []
-        for i, item in enumerate(news_list[:10], 1):  # 飞书卡片限制
-            news_elements.append({
-                "tag": "div",
-                "text": {
-                    "tag": "text",
-                    "content": f"**{i}. {self._escape_md(item['title'])}**\n📰 {item['source']} | 🕐 {item['published_str']}\n{item.get('summary', '')[:100]}...\n[查看原文]({item['link']})"
-                }
-            })
-
-        card = {
+            return [self._generate_empty_feishu_card()]
+
+        max_bytes = FEISHU_CARD_CONFIG.get("max_bytes", 18 * 1024)
+        max_elements = FEISHU_CARD_CONFIG.get("max_elements", 40)
+
+        if self.compact:
+            intro = self._feishu_text(f"🆕 新增 {len(news_list)} 条")
+            footer = self._feishu_text(f"*更新时间: {datetime.now(LOCAL_TZ).strftime('%H:%M')}*")
+            render_item = self._render_feishu_compact_item
+        else:
+            intro = self._feishu_text(f"📊 今日要闻 ({len(news_list)}条)\n\n")
+            footer = self._feishu_text(
+                f"\n---\n*数据来源: Automotive News Europe, Autocar, Just Auto*\n*生成时间: {datetime.now(LOCAL_TZ).strftime('%H:%M')}*"
+            )
+            render_item = lambda item: self._fragment('feishu', item, self._render_feishu_item)
+
+        # 空卡片的大小，标题按最长的分页后缀预留
+        base_size = len(serialize_card(self._feishu_card_shell(f"{self.today} (99/99)", [])))
+
+        chunks = [[intro]]
+        size = base_size + self._element_size(intro)
+        for i, item in enumerate(news_list, 1):
+            element = self._feishu_text(f"**{i}{render_item(item)}")
+            element_size = self._element_size(element)
+            # 每张卡片至少放一条新闻 (第一张还有开头的统计元素)，单条超限时无法再拆
+            min_elements = 1 if len(chunks) == 1 else 0
+            if len(chunks[-1]) > min_elements and (size + element_size > max_bytes or len(chunks[-1]) >= max_elements):
+                chunks.append([])
+                size = base_size
+            chunks[-1].append(element)
+            size += element_size
+
+        footer_size = self._element_size(footer)
+        if size + footer_size > max_bytes or len(chunks[-1]) >= max_elements:
+            chunks.append([])
+        chunks[-1].append(footer)
+
+        total = len(chunks)
+        return [
+            self._feishu_card_shell(self.today if total == 1 else f"{self.today} ({n}/{total})", elements)
+            for n, elements in enumerate(chunks, 1)
+        ]
+
+    @staticmethod
+    def _feishu_text(content: str) -> dict:
+        return {"tag": "div", "text": {"tag": "text", "content": content}}
+
+    @staticmethod
+    def _element_size(element: dict) -> int:
+        # 加上元素之间的逗号
+        return len(serialize_card(element)) + 1
+
+    def _feishu_card_shell(self, title: str, elements: List[dict]) -> dict:
+        return {
             "msg_type": "interactive",
             "card": {
                 "header": {
                     "title": {
                         "tag": "plain_text",
-                        "content": f"🚗 欧洲汽车早报 - {self.today}"
+                        "content": f"🚗 {self.title} - {title}"
                     },
                     "template": "blue"
                 },
-                "elements": [
-                    {
-                        "tag": "div",
-                        "text": {
-                            "tag": "text",
-                            "content": f"📊 今日要闻 ({len(news_list)}条)\n\n"
-                        }
-                    },
-                    *news_elements,
-                    {
-                        "tag": "div",
-                        "text": {
-                            "tag": "text",
-                            "content": f"\n---\n*数据来源: Automotive News Europe, Autocar, Just Auto*\n*生成时间: {datetime.now().strftime('%H:%M')}*"
-                        }
-                    }
-                ]
+                "elements": elements
             }
         }
 
-        return card
+    def _render_feishu_item(self, item: Dict) -> str:
+        return _FEISHU_ITEM.substitute(
+            title=self._escape_md(item["title"]),
+            source=self._format_source(item),
+            published=item["published_str"],
+            summary=self._clip(item.get("summary", ""), FEISHU_CARD_CONFIG.get("summary_chars", 200)),
+            link=item["link"],
+        )
+
+    def _render_feishu_compact_item(self, item: Dict) -> str:
+        published = item.get("published")
+        return _FEISHU_COMPACT_ITEM.substitute(
+            title=self._escape_md(item["title"]),
+            link=item["link"],
+            source=self._format_source(item),
+            time=published.astimezone(LOCAL_TZ).strftime("%H:%M") if published else "",
+        ).rstrip()
 
     def _generate_empty_report(self) -> str:
         """生成空报告"""
-        return f"""# 🚗 欧洲汽车早报 - {self.today}
+        return f"""# 🚗 {self.title} - {self.today}
 
 今日暂无汽车行业重大新闻。
 
 ---
 *数据来源: Automotive News Europe, Autocar, Just Auto等*
-*生成时间: {datetime.now().strftime('%H:%M:%S')}*
+*生成时间: {datetime.now(LOCAL_TZ).strftime('%H:%M:%S')}*
 """
 
     def _generate_empty_report_html(self) -> str:
         """生成空报告HTML"""
         return f"""<!DOCTYPE html>
 <html>
-<head><meta charset="UTF-8"><title>欧洲汽车早报</title></head>
+<head><meta charset="UTF-8"><title>{self.title}</title></head>
 <body>
-    <h1>欧洲汽车早报 - {self.today}</h1>
+    <h1>{self.title} - {self.today}</h1>
     <p>今日暂无汽车行业重大新闻。</p>
 </body>
 </html>
@@ -180,29 +310,114 @@ class NewsProcessor:
         """生成空飞书卡片"""
         return {
             "msg_type": "text",
-            "content": f"🚗 欧洲汽车早报 - {self.today}\n\n今日暂无汽车行业重大新闻。"
+            "content": {"text": f"🚗 {self.title} - {self.today}\n\n今日暂无汽车行业重大新闻。"}
         }
 
+    def _format_source(self, item: Dict) -> str:
+        """来源 - 合并过的相似新闻附带其他来源"""
+        others = item.get("other_sources")
+        if others:
+            return f"{item['source']} (另见: {', '.join(others)})"
+        return item["source"]
+
     def _escape_html(self, text: str) -> str:
         """HTML转义"""
-        return (text
-                .replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace('"', "&quot;"))
+        return text.translate(_HTML_ESCAPE)
+
+    @staticmethod
+    def _clip(text: str, max_chars: int) -> str:
+        """截断摘要，只在确实截断时加省略号"""
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars].rstrip() + "..."
 
     def _escape_md(self, text: str) -> str:
         """Markdown转义"""
-        return text.replace("[", "\\[").replace("]", "\\]")
-
-
-def process_news(news_list: List[Dict]) -> dict:
-    """处理新闻的便捷函数"""
-    processor = NewsProcessor()
-    return {
-        "markdown": processor.generate_markdown(news_list),
-        "html": processor.generate_html(news_list),
-        "feishu_card": processor.generate_feishu_card(news_list),
-        "news_count": len(news_list),
-        "date": processor.today
+        return text.translate(_MD_ESCAPE)
+
+
+class ProcessedNews:
+    """
+    处理结果 - 各格式在推送渠道首次使用时才生成，之后复用
+    兼容原来的字典用法: processed["markdown"] / processed["news_count"]
+    """
+
+    # 格式名 -> NewsProcessor的生成方法
+    FORMATS = {
+        "markdown": "generate_markdown",
+        "html": "generate_html",
+        "feishu_card": "generate_feishu_card",
+        "feishu_cards": "generate_feishu_cards",
     }
+
+    def __init__(self, news_list: List[Dict], processor: Optional[NewsProcessor] = None, metrics=None):
+        self.news_list = news_list
+        self.processor = processor or NewsProcessor()
+        self.metrics = metrics
+        self._rendered = {}
+        self._lock = threading.Lock()
+
+    @property
+    def news_count(self) -> int:
+        return len(self.news_list)
+
+    @property
+    def date(self) -> str:
+        return self.processor.today
+
+    def render(self, fmt: str):
+        """生成指定格式 (已生成过则直接返回)"""
+        if fmt not in self.FORMATS:
+            raise KeyError(fmt)
+
+        with self._lock:
+            if fmt not in self._rendered:
+                generate = getattr(self.processor, self.FORMATS[fmt])
+                if self.metrics is not None:
+                    with self.metrics.timer("render"):
+                        self._rendered[fmt] = generate(self.news_list)
+                else:
+                    self._rendered[fmt] = generate(self.news_list)
+            return self._rendered[fmt]
+
+    def prepare(self, formats: Iterable[str]):
+        """预先生成一组格式"""
+        for fmt in formats:
+            self.render(fmt)
+
+    @property
+    def rendered_formats(self) -> List[str]:
+        """已生成的格式"""
+        return list(self._rendered)
+
+    def preview_markdown(self, limit: int = 3) -> str:
+        """前几条新闻的Markdown预览 (不生成完整报告)"""
+        return self.processor.generate_markdown(self.news_list[:limit], total=len(self.news_list))
+
+    def __getitem__(self, key: str):
+        if key == "news_count":
+            return self.news_count
+        if key == "date":
+            return self.date
+        return self.render(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FORMATS or key in ("news_count", "date")
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def process_news(news_list: List[Dict], metrics=None, title: Optional[str] = None,
+                 date: Optional[datetime] = None, compact: bool = False) -> ProcessedNews:
+    """
+    处理新闻的便捷函数 - 返回按需生成各格式的处理结果
+    title为报告标题，date为报告日期，compact为使用精简飞书卡片
+    """
+    options = {"title": title, "date": date, "compact": compact}
+    options = {k: v for k, v in options.items() if v}
+    processor = NewsProcessor(**options) if options else None
+    return ProcessedNews(news_list, processor=processor, metrics=metrics)
@@ -0,0 +1,106 @@
+"""
+排序打分模块
+按关键词命中权重、来源优先级、时效衰减和转载数给候选新闻打分，
+整批计算分数后用大小为K的堆取前K条 (堆只省去全量排序，打分前的候选列表仍是完整的)
+"""
+
+import heapq
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from config import RANKING_CONFIG, RSS_SOURCES
+from dates import MIN_DATETIME, now_utc
+
+logger = logging.getLogger(__name__)
+
+# 向量化计算为可选功能
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 条目数少于这个值时纯Python更快 (省去数组转换)
+_NUMPY_MIN_BATCH = 64
+
+
+class Ranker:
+    """新闻打分排序器"""
+
+    def __init__(self, config: Optional[Dict] = None, sources: Optional[List[Dict]] = None,
+                 now: Optional[datetime] = None):
+        self.config = config or RANKING_CONFIG
+        self.keyword_weights = self.config.get("keyword_weights", {})
+        self.source_priority = {
+            s["name"]: float(s.get("priority", 1.0))
+            for s in (RSS_SOURCES if sources is None else sources)
+        }
+        self.now = now or now_utc()
+        # 每小时的衰减系数
+        self.decay = math.log(2) / max(self.config.get("half_life_hours", 12), 1e-6)
+
+    def features(self, news: Dict) -> tuple:
+        """(关键词权重之和, 来源优先级, 发布至今的小时数, 转载数)"""
+        keyword = sum(self.keyword_weights.get(k, 1.0) for k in news.get("keyword_hits", ()))
+        priority = self.source_priority.get(news.get("source"), 1.0)
+        published = news.get("published")
+        # 没有发布时间的条目不计时效分
+        age = max(0.0, (self.now - published).total_seconds() / 3600) if published else math.inf
+        return keyword, priority, age, news.get("cluster_size", 1)
+
+    def score_batch(self, features: List[tuple]) -> List[float]:
+        """批量计算分数"""
+        if not features:
+            return []
+
+        cfg = self.config
+        w_keyword = cfg.get("keyword_weight", 1.0)
+        w_source = cfg.get("source_weight", 1.0)
+        w_recency = cfg.get("recency_weight", 2.0)
+        w_cluster = cfg.get("cluster_weight", 1.0)
+
+        if np is not None and len(features) >= _NUMPY_MIN_BATCH:
+            keyword, priority, age, cluster = np.asarray(features, dtype=float).T
+            scores = (
+                w_keyword * np.log1p(keyword)
+                + w_source * priority
+                + w_recency * np.exp(-self.decay * age)
+                + w_cluster * np.log(np.maximum(cluster, 1.0))
+            )
+            return scores.tolist()
+
+        decay = self.decay
+        return [
+            w_keyword * math.log1p(keyword)
+            + w_source * priority
+            + w_recency * math.exp(-decay * age)
+            + w_cluster * math.log(max(cluster, 1))
+            for keyword, priority, age, cluster in features
+        ]
+
+    def top_k(self, news_list: Iterable[Dict], k: int) -> List[Dict]:
+        """
+        分数最高的k条，分数写入 news["score"]
+        分数相同时较新的优先，再相同时先到的优先
+        """
+        news_list = list(news_list)
+        scores = self.score_batch([self.features(news) for news in news_list])
+
+        top = heapq.nlargest(
+            max(k, 0),
+            zip(scores, (news.get("published") or MIN_DATETIME for news in news_list),
+                range(0, -len(news_list), -1), news_list),
+            key=lambda entry: entry[:3]
+        )
+
+        result = []
+        for score, _, _, news in top:
+            news["score"] = round(score, 4)
+            result.append(news)
+        return result
+
+
+def rank_news(news_list: Iterable[Dict], k: int) -> List[Dict]:
+    """打分取前k条的便捷函数"""
+    return Ranker().top_k(news_list, k)
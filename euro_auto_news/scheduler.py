@@ -0,0 +1,134 @@
+"""
+定时任务模块
+常驻进程内的调度器: 支持每日固定时刻和固定间隔两种任务，
+任务在同一个线程中依次执行，错过的时刻不补跑
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import logging
+
+from config import SCHEDULES
+from dates import LOCAL_TZ
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_TZ = LOCAL_TZ
+
+
+class Schedule:
+    """
+    单个定时任务
+    hour/minute: 每日固定时刻；every_minutes: 从零点起对齐的固定间隔
+    active_hours: [开始, 结束) 小时，只在这个时段内执行 (仅对固定间隔有效)，开始大于结束时跨零点，如 [22, 6]
+    其余配置项原样传给任务函数
+    """
+
+    _FIELDS = ("name", "job", "hour", "minute", "every_minutes", "active_hours", "enabled")
+
+    def __init__(self, spec: Dict):
+        self.name = spec.get("name", spec["job"])
+        self.job = spec["job"]
+        self.hour = spec.get("hour")
+        self.minute = spec.get("minute", 0)
+        self.every_minutes = spec.get("every_minutes")
+        self.active_hours = spec.get("active_hours")
+        self.options = {k: v for k, v in spec.items() if k not in self._FIELDS}
+
+        if (self.hour is None) == (self.every_minutes is None):
+            raise ValueError(f"定时任务 {self.name} 需要且只能指定 hour 或 every_minutes 之一")
+        if self.every_minutes is not None and self.every_minutes <= 0:
+            raise ValueError(f"定时任务 {self.name} 的 every_minutes 必须大于0")
+        if self.active_hours:
+            start, end = self.active_hours
+            if not (0 <= start <= 23 and 0 <= end <= 24) or start == end:
+                raise ValueError(f"定时任务 {self.name} 的 active_hours 无效: {self.active_hours}")
+
+    def is_active(self, when: datetime) -> bool:
+        """when是否在 active_hours 时段内 (未设置时总是返回True)"""
+        if not self.active_hours:
+            return True
+        start, end = self.active_hours
+        hour = when.astimezone(SCHEDULE_TZ).hour
+        if start < end:
+            return start <= hour < end
+        # 跨零点的时段
+        return hour >= start or hour < end
+
+    def next_run(self, after: datetime) -> datetime:
+        """after之后 (不含) 的下一次执行时间"""
+        after = after.astimezone(SCHEDULE_TZ)
+        midnight = after.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if self.hour is not None:
+            run = midnight.replace(hour=self.hour, minute=self.minute)
+            return run if run > after else run + timedelta(days=1)
+
+        step = timedelta(minutes=self.every_minutes)
+        run = midnight + step * ((after - midnight) // step + 1)
+        if self.active_hours:
+            # 一天内最多跳过 24*60/every_minutes 个时刻，再往后一定会落回时段内
+            for _ in range(24 * 60 // self.every_minutes + 2):
+                if self.is_active(run):
+                    break
+                run += step
+        return run
+
+    def __repr__(self) -> str:
+        when = f"{self.hour:02d}:{self.minute:02d}" if self.hour is not None else f"每{self.every_minutes}分钟"
+        return f"<Schedule {self.name} {self.job} {when}>"
+
+
+class Scheduler:
+    """调度器 - jobs为 任务名 -> 函数，函数接收Schedule中的其余配置项作为关键字参数"""
+
+    def __init__(self, jobs: Dict[str, Callable], schedules: Optional[List[Dict]] = None):
+        specs = SCHEDULES if schedules is None else schedules
+        self.jobs = jobs
+        self.schedules = [Schedule(spec) for spec in specs if spec.get("enabled", True)]
+        for schedule in self.schedules:
+            if schedule.job not in jobs:
+                raise ValueError(f"未知的任务类型: {schedule.job}")
+        self._stop = threading.Event()
+
+    def stop(self):
+        """停止调度 (当前正在执行的任务会先完成)"""
+        self._stop.set()
+
+    def run_forever(self):
+        if not self.schedules:
+            logger.warning("没有启用的定时任务")
+            return
+
+        now = datetime.now(SCHEDULE_TZ)
+        next_runs = {id(s): s.next_run(now) for s in self.schedules}
+        for schedule in self.schedules:
+            logger.info(f"定时任务 {schedule.name}: 下次执行 {next_runs[id(schedule)]:%Y-%m-%d %H:%M}")
+
+        while not self._stop.is_set():
+            due_at = min(next_runs.values())
+            wait = (due_at - datetime.now(SCHEDULE_TZ)).total_seconds()
+            # 分段等待，系统时间调整或休眠唤醒后也能及时重新计算
+            if wait > 0 and self._stop.wait(min(wait, 60)):
+                break
+            if wait > 0:
+                continue
+
+            # 同一时刻到期的任务按配置顺序执行
+            for schedule in self.schedules:
+                if next_runs[id(schedule)] <= datetime.now(SCHEDULE_TZ) and not self._stop.is_set():
+                    self._run(schedule)
+                    # 从执行结束的时间往后算，执行期间错过的时刻直接跳过
+                    next_runs[id(schedule)] = schedule.next_run(datetime.now(SCHEDULE_TZ))
+                    logger.info(f"定时任务 {schedule.name}: 下次执行 {next_runs[id(schedule)]:%Y-%m-%d %H:%M}")
+
+        logger.info("调度器已停止")
+
+    def _run(self, schedule: Schedule):
+        logger.info(f"⏰ 执行定时任务: {schedule.name}")
+        try:
+            self.jobs[schedule.job](**schedule.options)
+        except Exception as e:
+            # 单次任务失败不影响之后的调度
+            logger.exception(f"定时任务 {schedule.name} 执行失败: {str(e)}")
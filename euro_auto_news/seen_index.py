@@ -0,0 +1,191 @@
+"""
+已推送新闻索引模块
+基于SQLite记录已推送过的新闻 (规范化URL + 标题和摘要的内容哈希)，用于跨天去重
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import logging
+
+from config import SEEN_INDEX
+from near_dup import cluster_members
+
+logger = logging.getLogger(__name__)
+
+# 统计/追踪类参数，不影响文章本身
+TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "at_", "pk_")
+TRACKING_PARAMS = {"fbclid", "gclid", "cmpid", "ref", "src", "source", "ocid", "icid", "cid"}
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+# 内容哈希使用的摘要长度 (规范化后)
+_CONTENT_SUMMARY_CHARS = 200
+
+# SQLite单条语句的参数个数上限较低，批量查询时分块
+_QUERY_CHUNK = 500
+
+
+def normalize_url(url: str) -> str:
+    """规范化URL - 统一大小写、去掉片段、追踪参数和末尾斜杠"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAM_PREFIXES) and k.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    path = parts.path.rstrip("/") or "/"
+    # http/https视为同一篇文章
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+def normalize_title(title: str) -> str:
+    """规范化标题 - 小写并去掉标点和多余空白"""
+    return _NON_WORD_RE.sub(" ", (title or "").lower()).strip()
+
+
+def _digest(kind: bytes, text: str) -> bytes:
+    """8字节紧凑键"""
+    return hashlib.blake2b(kind + text.encode("utf-8"), digest_size=8).digest()
+
+
+def item_keys(link: str, title: str, summary: str = "") -> List[bytes]:
+    """
+    新闻的索引键: 规范化URL + 标题和摘要的内容哈希
+    没有摘要时只用URL，避免固定标题的栏目 (每周回顾等) 在保留期内都被当作已推送
+    """
+    keys = []
+    url = normalize_url(link)
+    if url:
+        keys.append(_digest(b"u:", url))
+    title = normalize_title(title)
+    summary = normalize_title(summary)[:_CONTENT_SUMMARY_CHARS]
+    if title and summary:
+        keys.append(_digest(b"c:", f"{title}\n{summary}"))
+    return keys
+
+
+class SeenIndex:
+    """已推送新闻索引"""
+
+    def __init__(self, path: str, ttl_days: float = 30):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 抓取在工作线程中进行，连接共享并由锁保护
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "key BLOB PRIMARY KEY, seen_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+        self.purge_expired()
+
+    def _cutoff(self) -> int:
+        return int(time.time() - self.ttl_seconds)
+
+    def seen_keys(self, keys: Iterable[bytes]) -> Set[bytes]:
+        """批量查询，返回其中已推送过的键"""
+        keys = list(set(keys))
+        found = set()
+        cutoff = self._cutoff()
+
+        with self._lock:
+            for i in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[i:i + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key FROM seen WHERE seen_at >= ? AND key IN ({placeholders})",
+                    [cutoff, *chunk]
+                )
+                found.update(row[0] for row in rows)
+
+        return found
+
+    def contains(self, link: str, title: str, summary: str = "") -> bool:
+        """判断单条新闻是否已推送过"""
+        return bool(self.seen_keys(item_keys(link, title, summary)))
+
+    def add_many(self, news_list: List[Dict]):
+        """记录已推送的新闻 (连同合并到它上面的其他转载)"""
+        now = int(time.time())
+        rows = [
+            (key, now)
+            for news in news_list
+            for member in cluster_members(news)
+            for key in item_keys(member.get("link", ""), member.get("title", ""), member.get("summary", ""))
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO seen (key, seen_at) VALUES (?, ?)", rows
+            )
+            self.conn.commit()
+
+    def purge_expired(self) -> int:
+        """清理过期记录"""
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM seen WHERE seen_at < ?", (self._cutoff(),))
+            self.conn.commit()
+        if cursor.rowcount:
+            logger.info(f"已清理 {cursor.rowcount} 条过期的推送记录")
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_seen_index() -> Optional[SeenIndex]:
+    """获取共享的索引实例，未启用时返回None"""
+    global _index
+    if not SEEN_INDEX.get("enabled"):
+        return None
+
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = SeenIndex(SEEN_INDEX["path"], SEEN_INDEX.get("ttl_days", 30))
+            except sqlite3.Error as e:
+                logger.error(f"打开已推送索引失败: {str(e)}")
+                return None
+        return _index
+
+
+def mark_delivered(news_list: List[Dict]):
+    """记录已推送新闻的便捷函数"""
+    index = get_seen_index()
+    if index is not None:
+        index.add_many(news_list)
@@ -0,0 +1,119 @@
+"""
+SMTP连接池模块
+保持已登录的SMTP会话，多封邮件/多个收件人复用同一次连接、STARTTLS和登录
+"""
+
+import atexit
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    """SMTP连接池 - 空闲连接复用前用NOOP检查是否仍然可用"""
+
+    def __init__(self, config: Dict, size: int = 2, timeout: float = 30):
+        self.config = config
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        # 限制同时打开的连接数
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(
+            self.config.get("smtp_server"),
+            self.config.get("smtp_port", 587),
+            timeout=self.timeout
+        )
+        server.starttls()
+        server.login(
+            self.config.get("smtp_user"),
+            self.config.get("smtp_password")
+        )
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def connection(self):
+        """借出一个已登录的连接，出错的连接直接丢弃"""
+        with self._slots:
+            server = None
+            while server is None:
+                try:
+                    server = self._idle.get_nowait()
+                except queue.Empty:
+                    server = self._connect()
+                    break
+                if not self._is_alive(server):
+                    self._close(server)
+                    server = None
+
+            try:
+                yield server
+            except Exception:
+                self._close(server)
+                raise
+            else:
+                self._idle.put(server)
+
+    def send(self, from_addr: str, to_addrs: List[str], message: str):
+        """发送一封邮件"""
+        with self.connection() as server:
+            server.sendmail(from_addr, to_addrs, message)
+
+    def send_many(self, messages: List[Tuple[str, List[str], str]]):
+        """在同一个会话中依次发送多封邮件 (from_addr, to_addrs, message)"""
+        with self.connection() as server:
+            for from_addr, to_addrs, message in messages:
+                server.sendmail(from_addr, to_addrs, message)
+
+    def close_all(self):
+        """关闭所有空闲连接"""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(config: Dict, size: int = 2, timeout: float = 30) -> SMTPPool:
+    """按服务器和账号获取共享的连接池"""
+    key = (config.get("smtp_server"), config.get("smtp_port", 587), config.get("smtp_user"))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SMTPPool(config, size=size, timeout=timeout)
+            _pools[key] = pool
+        return pool
+
+
+@atexit.register
+def _close_pools():
+    for pool in list(_pools.values()):
+        pool.close_all()
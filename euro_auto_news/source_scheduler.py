@@ -0,0 +1,212 @@
+"""
+自适应轮询模块
+根据条目的发布时间学习每个源的更新频率，参考 <ttl>/sy:updatePeriod 提示和 Retry-After，
+决定每个源多久抓取一次；失败时指数退避，连续失败达到阈值后熔断一段时间
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+import logging
+
+from config import SOURCE_SCHEDULE
+
+logger = logging.getLogger(__name__)
+
+# sy:updatePeriod 对应的秒数
+_UPDATE_PERIODS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+}
+
+# 学习发布间隔时只看最近的条目
+_RECENT_ENTRIES = 20
+
+
+def feed_hint(feed_meta) -> Optional[float]:
+    """源自己声明的更新间隔 (秒) - <ttl> 为分钟数，sy:updatePeriod/updateFrequency 为每周期更新次数"""
+    hints = []
+
+    try:
+        ttl = int(feed_meta.get("ttl") or 0)
+        if ttl > 0:
+            hints.append(ttl * 60)
+    except (TypeError, ValueError):
+        pass
+
+    period = _UPDATE_PERIODS.get(str(feed_meta.get("sy_updateperiod") or "").strip().lower())
+    if period:
+        try:
+            frequency = max(1, int(feed_meta.get("sy_updatefrequency") or 1))
+        except (TypeError, ValueError):
+            frequency = 1
+        hints.append(period / frequency)
+
+    return max(hints) if hints else None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 头 - 秒数或HTTP日期，返回需要等待的秒数"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class SourceScheduler:
+    """
+    各源的轮询计划，按URL保存:
+    interval: 当前轮询间隔；next_poll: 下次允许抓取的时间；failures: 连续失败次数
+    """
+
+    def __init__(self, path: str, config: Optional[Dict] = None):
+        self.path = path
+        self.config = config or SOURCE_SCHEDULE
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._state = self._load()
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"读取轮询计划失败: {str(e)}")
+            return {}
+
+    def save(self):
+        """有变化时写回磁盘"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._state, ensure_ascii=False, indent=1)
+            self._dirty = False
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"写入轮询计划失败: {str(e)}")
+
+    def _entry(self, url: str) -> Dict:
+        entry = self._state.get(url)
+        if entry is None:
+            entry = {"interval": self.config.get("default_interval", 900), "next_poll": 0, "failures": 0}
+            self._state[url] = entry
+        return entry
+
+    def poll_status(self, url: str, now: Optional[float] = None) -> str:
+        """
+        当前是否可以抓取:
+        due 到期；not_due 未到轮询时间；backoff 失败后退避中；circuit_open 熔断中
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._state.get(url)
+            if entry is None or entry["next_poll"] <= now:
+                return "due"
+            if entry["failures"] >= self.config.get("breaker_threshold", 5):
+                return "circuit_open"
+            return "backoff" if entry["failures"] else "not_due"
+
+    def record_success(self, url: str, timestamps: Iterable[float] = (), hint: Optional[float] = None,
+                       not_modified: bool = False, now: Optional[float] = None):
+        """
+        抓取成功 - 根据条目发布时间重新估计轮询间隔
+        not_modified: 源未更新 (304)，间隔逐步放大
+        hint: 源声明的更新间隔，轮询间隔不会比它更短
+        """
+        now = time.time() if now is None else now
+        cfg = self.config
+
+        with self._lock:
+            entry = self._entry(url)
+            interval = entry["interval"]
+
+            if not_modified:
+                interval *= 1.5
+            else:
+                learned = self._learn_interval(timestamps, now)
+                if learned is not None:
+                    interval = learned * cfg.get("rate_factor", 0.5)
+
+            if hint:
+                interval = max(interval, hint)
+            interval = min(cfg.get("max_interval", 6 * 3600), max(cfg.get("min_interval", 300), interval))
+
+            if entry["failures"] >= cfg.get("breaker_threshold", 5):
+                logger.info(f"源已恢复，结束熔断: {url}")
+            entry.update({
+                "interval": round(interval),
+                "next_poll": now + interval,
+                "failures": 0,
+                "last_success": now,
+            })
+            self._dirty = True
+
+    def record_failure(self, url: str, retry_after: Optional[float] = None, now: Optional[float] = None):
+        """抓取失败 - 指数退避，连续失败达到阈值后熔断"""
+        now = time.time() if now is None else now
+        cfg = self.config
+
+        with self._lock:
+            entry = self._entry(url)
+            entry["failures"] += 1
+            failures = entry["failures"]
+
+            delay = min(
+                cfg.get("max_backoff", 3 * 3600),
+                cfg.get("backoff_base", 300) * 2 ** (failures - 1)
+            ) * (0.8 + random.random() * 0.4)
+            if retry_after:
+                delay = max(delay, retry_after)
+            if failures >= cfg.get("breaker_threshold", 5):
+                delay = max(delay, cfg.get("breaker_cooldown", 12 * 3600))
+                logger.warning(f"源连续失败 {failures} 次，熔断 {delay / 3600:.1f} 小时: {url}")
+
+            entry["next_poll"] = now + delay
+            self._dirty = True
+
+    @staticmethod
+    def _learn_interval(timestamps: Iterable[float], now: float) -> Optional[float]:
+        """最近条目发布间隔的中位数，条目不足时返回None"""
+        recent = sorted({t for t in timestamps if t and t <= now}, reverse=True)[:_RECENT_ENTRIES]
+        if len(recent) < 2:
+            return None
+        gaps = sorted(a - b for a, b in zip(recent, recent[1:]))
+        return gaps[len(gaps) // 2]
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_source_scheduler() -> Optional[SourceScheduler]:
+    """获取共享的轮询计划，未启用时返回None"""
+    global _scheduler
+    if not SOURCE_SCHEDULE.get("enabled"):
+        return None
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SourceScheduler(SOURCE_SCHEDULE["path"])
+        return _scheduler
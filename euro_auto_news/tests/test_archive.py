@@ -0,0 +1,77 @@
+"""新闻归档 (archive.py) 的测试"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from archive import NewsArchive, build_match_query
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("BMW battery", '"BMW" "battery"'),
+    ("batt*", '"batt"*'),
+    # FTS5语法符号当作分隔符，不会造成查询语法错误
+    ('tariff* AND "EU" -(china)', '"tariff"* "AND" "EU" "china"'),
+    ("Škoda's e-Golf", '"Škoda" "s" "e" "Golf"'),
+    ("  ", ""),
+    ('"*"', ""),
+])
+def test_build_match_query(text, expected):
+    assert build_match_query(text) == expected
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = NewsArchive(str(tmp_path / "archive.sqlite3"))
+    now = datetime.now(timezone.utc)
+    archive.add_many([
+        {"title": "BMW battery plant opens in Hungary", "summary": "Debrecen cells", "source": "Autocar",
+         "link": "https://a.example/bmw-battery", "published": now - timedelta(hours=2)},
+        {"title": "BMW battery supplier expands", "summary": "New cell line", "source": "Just Auto - Europe",
+         "link": "https://b.example/bmw-battery", "published": now - timedelta(days=3)},
+        {"title": "BMW battery recall in Germany", "summary": "Old story", "source": "Autocar",
+         "link": "https://a.example/bmw-recall", "published": now - timedelta(days=40)},
+        {"title": "Renault tariffs", "summary": "Batteries from China", "source": "Autocar",
+         "link": "https://a.example/renault", "published": now - timedelta(hours=1)},
+    ])
+    yield archive
+    archive.close()
+
+
+def _links(results):
+    return {r["link"] for r in results}
+
+
+def test_search_matches_all_terms_and_prefixes(archive):
+    assert _links(archive.search("BMW battery")) == {
+        "https://a.example/bmw-battery", "https://b.example/bmw-battery", "https://a.example/bmw-recall",
+    }
+    # porter词干: batteries 与 battery 匹配
+    assert "https://a.example/renault" in _links(archive.search("battery"))
+    assert _links(archive.search("tarif*")) == {"https://a.example/renault"}
+    assert archive.search("") == []
+
+
+def test_search_days_filter(archive):
+    assert _links(archive.search("BMW battery", days=30)) == {
+        "https://a.example/bmw-battery", "https://b.example/bmw-battery",
+    }
+    assert _links(archive.search("BMW battery", days=1)) == {"https://a.example/bmw-battery"}
+
+
+def test_search_source_filter(archive):
+    assert _links(archive.search("BMW", source="Autocar")) == {
+        "https://a.example/bmw-battery", "https://a.example/bmw-recall",
+    }
+    assert _links(archive.search("BMW", source="Autocar", days=30)) == {"https://a.example/bmw-battery"}
+    assert archive.search("BMW", source="Unknown") == []
+
+
+def test_add_many_skips_existing_links(archive):
+    count = len(archive)
+    assert archive.add_many([
+        {"title": "BMW battery plant opens in Hungary", "summary": "", "source": "GCR",
+         "link": "https://a.example/bmw-battery/?utm_source=rss"},
+        {"title": "", "link": "https://a.example/untitled"},
+    ]) == 0
+    assert len(archive) == count
@@ -0,0 +1,63 @@
+"""历史回放 (backfill.py) 的测试"""
+
+import json
+import os
+from datetime import date, timedelta
+
+from archive import NewsArchive
+from backfill import INDEX_FILE, backfill, digest_time
+
+DAYS = [date(2026, 10, 16), date(2026, 10, 17)]
+
+
+def _make_archive(path):
+    archive = NewsArchive(path)
+    news = []
+    for day in DAYS:
+        now = digest_time(day)
+        for i, (source, title) in enumerate([
+            ("Autocar", f"BMW launches electric SUV for Europe on {day}"),
+            ("Just Auto - Europe", f"Volkswagen recalls ID.4 cars in Germany over battery fault {day}"),
+            ("Green Car Reports", f"Volkswagen recalls ID.4 cars in Germany over battery fault {day}"),
+            ("Automotive IQ", f"Stellantis cuts EV production at Italian plant {day}"),
+            ("Autocar", f"Formula E racing returns to Berlin {day}"),
+        ]):
+            news.append({
+                "title": title,
+                "summary": f"{title}. Details for the European market.",
+                "source": source,
+                "link": f"https://example.com/{day}/{i}",
+                "published": now - timedelta(hours=i + 1),
+            })
+    archive.add_many(news)
+    archive.close()
+
+
+def _load_index(out_dir):
+    """读取 index.json，去掉与运行时长有关的字段"""
+    with open(os.path.join(out_dir, INDEX_FILE), encoding="utf-8") as f:
+        index = json.load(f)
+    index.pop("seconds")
+    for day in index["days"]:
+        day.pop("seconds")
+    return index
+
+
+def test_index_is_the_same_for_one_and_two_processes(tmp_path):
+    archive_path = str(tmp_path / "archive.sqlite3")
+    _make_archive(archive_path)
+
+    indexes = []
+    for processes in (1, 2):
+        out_dir = str(tmp_path / f"out_{processes}")
+        backfill(DAYS[0], DAYS[-1], out_dir, formats=["markdown", "feishu_cards"],
+                 processes=processes, archive_path=archive_path)
+        indexes.append(_load_index(out_dir))
+
+    single, parallel = indexes
+    assert [day["date"] for day in single["days"]] == [day.isoformat() for day in DAYS]
+    # 每天: 一篇转载被近似去重，一篇命中排除关键词
+    assert all(day["candidates"] == 5 and len(day["selected"]) == 3 for day in single["days"])
+    assert single == parallel
+    # 早报文件页脚带有生成时刻，只比较文件名
+    assert sorted(os.listdir(tmp_path / "out_1")) == sorted(os.listdir(tmp_path / "out_2"))
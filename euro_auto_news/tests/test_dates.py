@@ -0,0 +1,51 @@
+"""日期解析 (dates.py) 的测试 - 需要在CI使用的Python 3.10上同样通过"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from dates import entry_datetime, parse_date
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("value, expected", [
+    # RFC-822
+    ("Sat, 17 Oct 2026 08:30:00 +0200", _utc(2026, 10, 17, 6, 30)),
+    ("Sat, 17 Oct 2026 08:30:00 -0530", _utc(2026, 10, 17, 14, 0)),
+    ("Sat, 17 Oct 2026 08:30:00 GMT", _utc(2026, 10, 17, 8, 30)),
+    ("Sat, 17 Oct 2026 08:30:00 EDT", _utc(2026, 10, 17, 12, 30)),
+    ("17 Oct 2026 08:30 +0000", _utc(2026, 10, 17, 8, 30)),
+    # 未知时区名按UTC处理
+    ("Sat, 17 Oct 2026 08:30:00 CEST", _utc(2026, 10, 17, 8, 30)),
+    # ISO-8601
+    ("2026-10-17T08:30:00Z", _utc(2026, 10, 17, 8, 30)),
+    ("2026-10-17T08:30:00z", _utc(2026, 10, 17, 8, 30)),
+    ("2026-10-17T08:30:00+02:00", _utc(2026, 10, 17, 6, 30)),
+    ("2026-10-17T08:30:00+0200", _utc(2026, 10, 17, 6, 30)),
+    ("2026-10-17T08:30:00+02", _utc(2026, 10, 17, 6, 30)),
+    ("2026-10-17T08:30:00.12+02:00", _utc(2026, 10, 17, 6, 30, 0, 120000)),
+    ("2026-10-17T08:30:00.123456789Z", _utc(2026, 10, 17, 8, 30, 0, 123456)),
+    ("2026-10-17 08:30:00 -05:00", _utc(2026, 10, 17, 13, 30)),
+    ("2026-10-17T08:30", _utc(2026, 10, 17, 8, 30)),
+    ("2026-10-17", _utc(2026, 10, 17)),
+])
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "", "   ", "yesterday", "2026-13-45T08:30:00Z", "2026-10-17T25:00:00Z", "Sat, 32 Oct 2026 08:30:00 GMT",
+])
+def test_unparseable_dates(value):
+    assert parse_date(value) is None
+
+
+def test_entry_datetime_prefers_newer_update():
+    published = _utc(2026, 10, 17, 8, 0).utctimetuple()
+    updated = _utc(2026, 10, 17, 9, 0).utctimetuple()
+    assert entry_datetime({"published_parsed": published, "updated_parsed": updated}) == _utc(2026, 10, 17, 9)
+    assert entry_datetime({"published_parsed": published}) == _utc(2026, 10, 17, 8)
+    assert entry_datetime({}) is None
@@ -0,0 +1,59 @@
+"""快速feed解析 (fast_feed.py) 与feedparser的一致性测试"""
+
+import glob
+import os
+
+import feedparser
+import pytest
+
+import fast_feed
+from dates import entry_datetime, install_feedparser_handler
+from fast_feed import FallbackRequired, parse_fast
+from fetcher import SUMMARY_MAX_CHARS
+from html_text import html_to_text
+from source_scheduler import feed_hint
+
+FIXTURES = sorted(glob.glob(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "*"
+)))
+
+
+def _fields(entry) -> tuple:
+    """与 NewsFetcher.parse_entry 使用的字段一致"""
+    return (
+        entry.get("title", "").strip(),
+        entry.get("link", "").strip(),
+        html_to_text(entry.get("summary", ""), SUMMARY_MAX_CHARS),
+        entry_datetime(entry),
+    )
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_matches_feedparser(path):
+    install_feedparser_handler()
+    with open(path, "rb") as f:
+        content = f.read()
+    expected = feedparser.parse(content)
+    actual = parse_fast(content)
+
+    assert feed_hint(actual.feed) == feed_hint(expected.feed)
+    assert [_fields(e) for e in actual.entries] == [_fields(e) for e in expected.entries]
+
+
+RSS = (b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+       b'<item><title>A</title><link>%s</link><pubDate>Sun, 18 Oct 2026 06:30:00 GMT</pubDate></item>'
+       b'</channel></rss>')
+
+
+def test_relative_link_needs_fallback():
+    with pytest.raises(FallbackRequired):
+        parse_fast(RSS % b"/news/a")
+
+
+def test_parse_falls_back_to_feedparser():
+    # 格式错误的XML (未转义的&) 由feedparser容错解析
+    feed = fast_feed.parse(RSS % b"https://example.com/a?x=1&y=2", fast=True)
+    assert feed.entries[0]["link"].startswith("https://example.com/a")
+
+    feed = fast_feed.parse(RSS % b"https://example.com/a", fast=True)
+    assert feed.version == "rss20" and feed.entries[0]["title"] == "A"
@@ -0,0 +1,77 @@
+"""条件请求缓存 (feed_cache.py) 及抓取时的304处理测试"""
+
+import os
+from datetime import datetime, timezone
+
+from feed_cache import FeedCache
+from fetcher import NewsFetcher
+from models import NewsItem
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "benchmarks", "fixtures", "autocar.xml")
+URL = "https://example.com/feed.xml"
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"HTTP {self.status_code}")
+
+
+class FakeHttp:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def _fetcher(tmp_path, responses):
+    fetcher = NewsFetcher()
+    fetcher.feed_cache = FeedCache(str(tmp_path / "feed_cache"))
+    fetcher.http = FakeHttp(responses)
+    fetcher.seen_index = None
+    fetcher.archive = None
+    fetcher.source_scheduler = None
+    fetcher.parse_pool = None
+    return fetcher
+
+
+def test_round_trip(tmp_path):
+    cache = FeedCache(str(tmp_path))
+    published = datetime(2026, 10, 18, 6, 30, tzinfo=timezone.utc)
+    cache.save(URL, '"abc"', "Sun, 18 Oct 2026 06:30:00 GMT",
+               [NewsItem("Title", "https://example.com/a", "Summary", "Autocar", published)])
+
+    cached = cache.load(URL)
+    assert cached["items"][0].published == published
+    assert cached["items"][0].title == "Title"
+    assert FeedCache.conditional_headers(cached) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Sun, 18 Oct 2026 06:30:00 GMT",
+    }
+    assert cache.load("https://example.com/other.xml") is None
+
+
+def test_not_modified_reuses_cached_items(tmp_path):
+    with open(FIXTURE, "rb") as f:
+        content = f.read()
+    source = {"name": "Autocar", "url": URL}
+    fetcher = _fetcher(tmp_path, [
+        FakeResponse(200, content, {"ETag": '"v1"'}),
+        FakeResponse(304),
+    ])
+
+    first = fetcher.fetch_rss(source)
+    second = fetcher.fetch_rss(source)
+
+    assert first and [n.link for n in second] == [n.link for n in first]
+    assert fetcher.http.requests[1]["If-None-Match"] == '"v1"'
+    assert fetcher.metrics.sources["Autocar"]["status"] == "not_modified"
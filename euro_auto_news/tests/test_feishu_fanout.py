@@ -0,0 +1,56 @@
+"""飞书多群推送 (feishu_fanout.py) 的测试"""
+
+import json
+from datetime import datetime, timezone
+
+from feishu_fanout import FeishuFanout
+from models import NewsItem
+from processor import process_news
+
+NOW = datetime(2026, 10, 18, 7, 0, tzinfo=timezone.utc)
+
+TARGETS = [
+    {"name": "全部", "webhook": "https://hook.example/all"},
+    {"name": "电动车组", "webhook": "https://hook.example/ev", "profile": "ev"},
+]
+PROFILES = {"ev": {"keywords": ["battery", "charging"]}}
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def json(self):
+        return {"code": 0}
+
+
+class FakeHttp:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append((url, json.loads(kwargs["data"])))
+        return FakeResponse()
+
+
+def _deliver(compact):
+    news = [NewsItem("Renault unveils new Twingo for Europe", "https://example.com/twingo",
+                     "The city car goes on sale next spring.", "Autocar", NOW)]
+    fanout = FeishuFanout(TARGETS, profiles=PROFILES, rate_limit={"rate": 100, "burst": 10})
+    fanout.http = FakeHttp()
+    report = fanout.deliver(process_news(news, date=NOW, compact=compact))
+    return report, [url for url, _ in fanout.http.posts]
+
+
+def test_compact_push_skips_targets_without_matches():
+    report, urls = _deliver(compact=True)
+
+    assert urls == ["https://hook.example/all"]
+    assert report[1]["skipped"] and report[1]["success"]
+
+
+def test_digest_still_sends_empty_notice_to_profile_targets():
+    report, urls = _deliver(compact=False)
+
+    assert sorted(urls) == ["https://hook.example/all", "https://hook.example/ev"]
+    assert all(r["success"] and not r.get("skipped") for r in report)
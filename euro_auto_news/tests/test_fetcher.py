@@ -0,0 +1,67 @@
+"""并发抓取 (fetcher.NewsFetcher.iter_fetched) 的测试"""
+
+import os
+import threading
+
+import fetcher
+from feed_cache import FeedCache
+from fetcher import NewsFetcher
+from source_scheduler import SourceScheduler
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "benchmarks", "fixtures", "autocar.xml")
+FAST_URL = "https://fast.example/feed.xml"
+HUNG_URL = "https://hung.example/feed.xml"
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class HangingHttp:
+    """HUNG_URL 一直挂起，直到测试结束"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        with open(FIXTURE, "rb") as f:
+            self.content = f.read()
+
+    def get(self, url, headers=None, timeout=None):
+        if url == HUNG_URL:
+            self.release.wait(5)
+        return FakeResponse(self.content)
+
+
+def test_sources_missing_the_deadline_back_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetcher, "RSS_SOURCES", [
+        {"name": "Hung", "url": HUNG_URL},
+        {"name": "Fast", "url": FAST_URL},
+    ])
+    monkeypatch.setitem(fetcher.FETCH_CONFIG, "deadline", 0.5)
+    monkeypatch.setitem(fetcher.FETCH_CONFIG, "host_interval", 0)
+
+    news_fetcher = NewsFetcher()
+    news_fetcher.http = HangingHttp()
+    news_fetcher.feed_cache = FeedCache(str(tmp_path / "feed_cache"))
+    news_fetcher.source_scheduler = SourceScheduler(str(tmp_path / "schedule.json"))
+    news_fetcher.seen_index = None
+    news_fetcher.archive = None
+    news_fetcher.parse_pool = None
+    try:
+        items = list(news_fetcher.iter_fetched())
+    finally:
+        news_fetcher.http.release.set()
+
+    assert items and all(item.source == "Fast" for item in items)
+    assert news_fetcher.metrics.sources["Hung"]["status"] == "timeout"
+    # 已写入磁盘: 下次运行时处于退避中
+    scheduler = SourceScheduler(str(tmp_path / "schedule.json"))
+    assert scheduler.poll_status(HUNG_URL) == "backoff"
+    assert scheduler.poll_status(FAST_URL) == "not_due"
@@ -0,0 +1,73 @@
+"""HTML转纯文本 (html_text.py) 的测试"""
+
+import random
+
+import pytest
+
+from html_text import _convert, _cut_position, html_to_text
+
+
+def _reference(html_text, max_chars):
+    """不做前缀截断、完整转换后再截取的结果"""
+    return _convert(html_text)[:max_chars].rstrip()
+
+
+def test_blocks_tags_and_entities():
+    html = "<p>Audi&nbsp;Q6 <b>e-tron</b></p><p>Price: &euro;70,000 &amp; up</p><br/>Done"
+    assert html_to_text(html) == "Audi Q6 e-tron Price: €70,000 & up Done"
+
+
+def test_script_style_and_comments_removed():
+    html = ("<style>p { color: red; }</style><p>Kept</p><script type='text/javascript'>"
+            "var x = '<p>not text</p>';</script><!-- <p>hidden</p> --><noscript>no</noscript> text")
+    assert html_to_text(html) == "Kept text"
+
+
+@pytest.mark.parametrize("html, expected", [
+    ("Range 5 < 6 hours", "Range 5 < 6 hours"),
+    ("x<1 and y>2", "x<1 and y>2"),
+    ("&lt;p&gt; is a tag", "<p> is a tag"),
+    ("<p>3 <5</p>", "3 <5"),
+])
+def test_comparisons_stay_as_text(html, expected):
+    assert html_to_text(html) == expected
+
+
+def test_truncation_uses_prefix_within_budget():
+    paragraph = "<p>" + "word " * 20 + "</p>"
+    html = paragraph * 200
+    end = _cut_position(html, 100)
+
+    # 只转换前缀: 截断点在标记边界上，远小于全文
+    assert end < len(html) // 10
+    assert html[end] == "<"
+    assert html_to_text(html, 100) == _reference(html, 100)
+    assert len(html_to_text(html, 100)) <= 100
+
+
+def test_entity_heavy_prefix_falls_back_to_full_text():
+    # 实体解码后远短于原文，1.5倍预留不够，需要退回处理全文
+    html = "<i>" + "&amp;" * 400 + "</i>" + "<b>tail</b>" * 50
+    assert html_to_text(html, 300) == _reference(html, 300)
+    assert len(html_to_text(html, 300)) == 300
+
+
+def test_cut_point_next_to_entities():
+    html = "".join(f"<span>A&amp;B {i} &quot;x&quot;</span>" for i in range(300))
+    for max_chars in (10, 37, 99, 250, 1000):
+        assert html_to_text(html, max_chars) == _reference(html, max_chars)
+
+
+def test_random_documents_match_full_conversion():
+    rng = random.Random(7)
+    pieces = ["<p>", "</p>", "<br>", "<b>", "</b>", "&amp;", "&#8217;", "  ", "\n", "5 < 6",
+              "<script>x<y</script>", "<!-- c -->", "Volkswagen", "battery", "EV"]
+    for _ in range(200):
+        html = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 120)))
+        max_chars = rng.randint(1, 200)
+        assert html_to_text(html, max_chars) == _reference(html, max_chars)
+
+
+def test_empty_input():
+    assert html_to_text("") == ""
+    assert html_to_text(None) == ""
@@ -0,0 +1,14 @@
+"""共享HTTP客户端 (http_client.py) 的测试"""
+
+from http_client import HttpClient
+
+
+def test_session_does_not_sleep_for_retry_after():
+    client = HttpClient({"retries": 3})
+    retry = client._session.get_adapter("https://example.com/feed").max_retries
+
+    assert retry.respect_retry_after_header is False
+    # 429交给调用方 (SourceScheduler / 飞书分发) 处理
+    assert 429 not in retry.status_forcelist
+    assert retry.is_retry("GET", 503)
+    client.close()
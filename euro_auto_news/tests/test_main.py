@@ -0,0 +1,40 @@
+"""主程序单次任务入口 (main.run_job) 的测试"""
+
+from datetime import datetime
+
+import main
+from scheduler import SCHEDULE_TZ
+
+
+def _breaking_spec(**overrides):
+    spec = {"job": "breaking", "every_minutes": 10, "keywords": ["recall"], "enabled": True}
+    spec.update(overrides)
+    return spec
+
+
+def test_run_job_passes_schedule_options(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "SCHEDULES", [_breaking_spec()])
+    monkeypatch.setitem(main.JOBS, "breaking", lambda **options: calls.append(options) or True)
+
+    assert main.run_job("breaking") is True
+    assert calls == [{"keywords": ["recall"]}]
+
+
+def test_run_job_skips_disabled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "SCHEDULES", [_breaking_spec(enabled=False)])
+    monkeypatch.setitem(main.JOBS, "breaking", lambda **options: calls.append(options) or True)
+
+    assert main.run_job("breaking") is True
+    assert calls == []
+
+
+def test_run_job_skips_outside_active_hours(monkeypatch):
+    calls = []
+    hour = datetime.now(SCHEDULE_TZ).hour
+    monkeypatch.setattr(main, "SCHEDULES", [_breaking_spec(active_hours=[(hour + 1) % 24, (hour + 2) % 24])])
+    monkeypatch.setitem(main.JOBS, "breaking", lambda **options: calls.append(options) or True)
+
+    assert main.run_job("breaking") is True
+    assert calls == []
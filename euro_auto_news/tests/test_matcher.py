@@ -0,0 +1,60 @@
+"""关键词匹配 (matcher.py) 的测试"""
+
+import pytest
+
+from config import EXCLUDE_KEYWORDS, FILTER_KEYWORDS
+from matcher import KeywordMatcher
+
+FILTER = KeywordMatcher(FILTER_KEYWORDS)
+EXCLUDE = KeywordMatcher(EXCLUDE_KEYWORDS)
+BREAKING = KeywordMatcher(["recall", "launch", "unveil", "tariff"])
+
+
+@pytest.mark.parametrize("text, keyword", [
+    ("Solid-state batteries enter pilot production", "battery"),
+    ("Renault launched the new Twingo", "launch"),
+    ("Skoda launches Elroq in the UK", "launch"),
+    ("Fleet operators turn to electrified vans", "electrified"),
+    ("The electrification of heavy trucks", "electrification"),
+    ("Two new EVs from Kia", "EV"),
+    ("VW cuts prices", "VW"),
+    ("Europe's automakers", "Europe"),
+    ("European automakers", "European"),
+    ("Germany's car industries", "Germany"),
+])
+def test_filter_keywords_match_inflections(text, keyword):
+    assert keyword in FILTER.find(text)
+
+
+@pytest.mark.parametrize("text", [
+    "Every driver wants cheaper fuel",
+    "Revolution in hydrogen trucks",
+    "Levies on imports",
+])
+def test_acronyms_need_whole_words(text):
+    assert not FILTER.search(text)
+
+
+def test_exclude_keywords_match_inflections():
+    assert EXCLUDE.search("We reviewed the new Golf")
+    assert EXCLUDE.search("Rallies return to Wales")
+    assert not EXCLUDE.search("Preview of the Munich show")
+
+
+def test_breaking_keywords():
+    assert BREAKING.find("Stellantis recalled 80,000 vans") == {"recall"}
+    assert BREAKING.find("Hyundai unveiled a concept; EU tariffs loom") == {"unveil", "tariff"}
+    assert not BREAKING.search("Relaunch of a classic")
+
+
+def test_multi_word_keywords_and_canonical_form():
+    matcher = KeywordMatcher(["new model", "Car Industry", "car industry"])
+    assert matcher.keywords == ["new model", "Car Industry"]
+    assert matcher.find("Two NEW  models and a CAR industry outlook") == {"new model", "Car Industry"}
+    assert not matcher.search("renewed models")
+
+
+def test_empty_matcher():
+    matcher = KeywordMatcher(["", "  "])
+    assert not matcher
+    assert not matcher.search("anything") and matcher.find("anything") == set()
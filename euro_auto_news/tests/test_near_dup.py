@@ -0,0 +1,88 @@
+"""相似新闻合并 (near_dup.py) 及合并后的已推送记录测试"""
+
+from datetime import datetime, timedelta, timezone
+
+from intraday import IntradayState
+from models import NewsItem
+from near_dup import NearDuplicateIndex, cluster_near_duplicates
+from seen_index import SeenIndex
+
+TITLE = "Stellantis to cut 2,000 jobs at Mirafiori plant as EV demand slows"
+SUMMARY = "The carmaker said the voluntary redundancies would affect the Turin site where the Fiat 500e is built."
+
+
+def _copies():
+    return [
+        NewsItem(TITLE, "https://a.example/stellantis", SUMMARY, "Autocar"),
+        NewsItem(TITLE + " - report", "https://b.example/stellantis", SUMMARY, "Just Auto"),
+        NewsItem("Stellantis to cut 2,000 jobs at Mirafiori", "https://c.example/stellantis", SUMMARY, "GCR"),
+    ]
+
+
+def test_similar_copies_merge_into_first():
+    news = _copies()
+    news.append(NewsItem("Renault unveils new Twingo priced under 20,000 euros",
+                         "https://a.example/twingo", "The city car goes on sale next spring.", "Autocar"))
+    result = cluster_near_duplicates(news)
+
+    assert [n.link for n in result] == ["https://a.example/stellantis", "https://a.example/twingo"]
+    assert result[0].cluster_size == 3
+    assert result[0].other_sources == ["Just Auto", "GCR"]
+    assert [m["link"] for m in result[0].merged_items] == \
+        ["https://b.example/stellantis", "https://c.example/stellantis"]
+    assert result[1].merged_items is None
+
+
+def test_find_does_not_modify_index():
+    index = NearDuplicateIndex()
+    first, second, _ = _copies()
+    index.add(first)
+    assert index.find(index.signature(second)) is first
+    assert first.cluster_size == 1
+
+
+def test_empty_text_has_no_signature():
+    index = NearDuplicateIndex()
+    assert index.signature({"title": "", "summary": ""}) is None
+    assert index.add({"title": "", "summary": ""}) is None
+
+
+def test_delivering_representative_marks_whole_cluster(tmp_path):
+    representative = cluster_near_duplicates(_copies())[0]
+    index = SeenIndex(str(tmp_path / "seen.sqlite3"))
+    index.add_many([representative])
+
+    for copy in _copies():
+        assert index.contains(copy.link, "")
+    index.close()
+
+
+def test_intraday_records_merged_copies(tmp_path):
+    representative = cluster_near_duplicates(_copies())[0]
+    state = IntradayState(str(tmp_path / "intraday.json"))
+    state.record([representative])
+
+    assert state.new_items(_copies()) == []
+    # 重新载入后仍然有效
+    assert IntradayState(str(tmp_path / "intraday.json")).new_items(_copies()) == []
+
+
+def test_intraday_is_new_matches_new_items(tmp_path):
+    state = IntradayState(str(tmp_path / "intraday.json"))
+    first, *others = _copies()
+    state.record([first])
+
+    assert not state.is_new(others[0])
+    assert state.new_items(others) == [n for n in others if state.is_new(n)]
+
+
+def test_story_published_before_first_push_is_still_new(tmp_path):
+    state = IntradayState(str(tmp_path / "intraday.json"))
+    state.record([NewsItem("Renault unveils new Twingo priced under 20,000 euros",
+                           "https://a.example/twingo", "The city car goes on sale next spring.", "Autocar")])
+    # 早报推送前2分钟发布、之后的轮询才第一次抓到
+    recall = NewsItem("Stellantis recalls 80,000 electric vans over battery fire risk",
+                      "https://b.example/recall", "Vans across Europe are affected.", "Just Auto",
+                      datetime.now(timezone.utc) - timedelta(minutes=2))
+    assert state.is_new(recall)
+    assert IntradayState(str(tmp_path / "intraday.json")).is_new(recall)
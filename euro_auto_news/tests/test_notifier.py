@@ -0,0 +1,29 @@
+"""推送 (notifier.py) 的测试"""
+
+import time
+
+from notifier import Notifier
+from processor import process_news
+
+
+def test_slow_channel_reports_actual_result(monkeypatch):
+    notifier = Notifier()
+    notifier.feishu_webhook = "https://open.feishu.cn/open-apis/bot/v2/hook/test"
+    notifier.feishu_targets = []
+    notifier.email_config = {"enabled": False}
+    notifier.channel_timeout = {"feishu": 0.05}
+
+    sent = []
+
+    def slow_send(cards):
+        # 多张卡片依次发送，总时间超过 channel_timeout
+        time.sleep(0.2)
+        sent.append(cards)
+        return True
+
+    monkeypatch.setattr(notifier, "send_feishu", slow_send)
+    results = notifier.send_all(process_news([]))
+
+    assert results["feishu"] is True
+    assert sent
+    assert notifier.report["feishu"]["success"] is True
@@ -0,0 +1,56 @@
+"""新闻处理和各推送格式生成 (processor.py) 的测试"""
+
+from datetime import datetime, timedelta, timezone
+
+from config import FEISHU_CARD_CONFIG
+from models import NewsItem
+from processor import NewsProcessor, process_news, serialize_card
+
+NOW = datetime(2026, 10, 18, 7, 0, tzinfo=timezone.utc)
+
+
+def _news_list(count, summary_words=30):
+    return [
+        NewsItem(
+            f"Automaker {i} announces new electric model for Europe",
+            f"https://example.com/news/{i}",
+            " ".join(f"word{i}x{j}" for j in range(summary_words)),
+            "Autocar",
+            NOW - timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+def test_preview_heading_shows_full_count():
+    processed = process_news(_news_list(8), date=NOW)
+    preview = processed.preview_markdown(3)
+
+    assert "今日要闻 (8条)" in preview
+    assert preview.count("### ") == 3
+    # 预览不生成完整格式
+    assert processed.rendered_formats == []
+
+
+def test_split_cards_stay_within_max_bytes(monkeypatch):
+    monkeypatch.setitem(FEISHU_CARD_CONFIG, "max_bytes", 900)
+    monkeypatch.setitem(FEISHU_CARD_CONFIG, "max_elements", 40)
+    news_list = _news_list(12)
+
+    for compact in (False, True):
+        cards = NewsProcessor(date=NOW, compact=compact).generate_feishu_cards(news_list)
+        assert len(cards) > 2
+        for card in cards:
+            assert len(serialize_card(card)) <= 900
+        # 全部新闻都在，且按顺序
+        text = "".join(e["text"]["content"] for card in cards for e in card["card"]["elements"])
+        positions = [text.index(f"https://example.com/news/{i})") for i in range(12)]
+        assert positions == sorted(positions)
+
+
+def test_split_cards_respect_max_elements(monkeypatch):
+    monkeypatch.setitem(FEISHU_CARD_CONFIG, "max_elements", 4)
+    cards = NewsProcessor(date=NOW).generate_feishu_cards(_news_list(10, summary_words=3))
+
+    assert all(len(card["card"]["elements"]) <= 4 for card in cards)
+    assert cards[0]["card"]["header"]["title"]["content"].endswith(f"(1/{len(cards)})")
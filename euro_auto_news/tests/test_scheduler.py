@@ -0,0 +1,49 @@
+"""定时任务 (scheduler.py) 的测试"""
+
+from datetime import datetime
+
+import pytest
+
+from scheduler import SCHEDULE_TZ, Schedule
+
+
+def _at(day, hour, minute=0):
+    return datetime(2026, 10, day, hour, minute, tzinfo=SCHEDULE_TZ)
+
+
+def test_daily_schedule():
+    schedule = Schedule({"job": "digest", "hour": 7, "minute": 30})
+    assert schedule.next_run(_at(18, 6)) == _at(18, 7, 30)
+    assert schedule.next_run(_at(18, 7, 30)) == _at(19, 7, 30)
+
+
+def test_interval_within_active_hours():
+    schedule = Schedule({"job": "breaking", "every_minutes": 10, "active_hours": [8, 22]})
+    assert schedule.next_run(_at(18, 9, 3)) == _at(18, 9, 10)
+    assert schedule.next_run(_at(18, 21, 55)) == _at(19, 8)
+    assert schedule.next_run(_at(18, 3)) == _at(18, 8)
+
+
+def test_overnight_active_hours():
+    schedule = Schedule({"job": "breaking", "every_minutes": 30, "active_hours": [22, 6]})
+    assert schedule.next_run(_at(18, 12)) == _at(18, 22)
+    assert schedule.next_run(_at(18, 23, 45)) == _at(19, 0)
+    assert schedule.next_run(_at(19, 5, 30)) == _at(19, 22)
+    assert schedule.is_active(_at(18, 2)) and not schedule.is_active(_at(18, 6))
+
+
+def test_options_passed_through():
+    schedule = Schedule({"job": "breaking", "every_minutes": 10, "keywords": ["recall"], "enabled": True})
+    assert schedule.options == {"keywords": ["recall"]}
+
+
+@pytest.mark.parametrize("spec", [
+    {"job": "digest"},
+    {"job": "digest", "hour": 7, "every_minutes": 10},
+    {"job": "breaking", "every_minutes": 0},
+    {"job": "breaking", "every_minutes": 10, "active_hours": [8, 8]},
+    {"job": "breaking", "every_minutes": 10, "active_hours": [8, 25]},
+])
+def test_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        Schedule(spec)
@@ -0,0 +1,42 @@
+"""已推送新闻索引 (seen_index.py) 的测试"""
+
+from seen_index import SeenIndex, item_keys, normalize_url
+
+
+def test_normalize_url_drops_tracking_and_scheme():
+    assert normalize_url("https://www.Example.com/news/a/?utm_source=x&id=3#top") == \
+        normalize_url("http://example.com/news/a?id=3")
+
+
+def test_content_key_requires_summary():
+    assert len(item_keys("https://example.com/a", "Weekly round-up")) == 1
+    assert len(item_keys("https://example.com/a", "Weekly round-up", "VW cuts prices")) == 2
+
+
+def test_recurring_title_with_new_content_is_not_seen(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.sqlite3"))
+    index.add_many([{
+        "link": "https://example.com/2026/10/11/weekly",
+        "title": "Weekly round-up",
+        "summary": "Stellantis recalls 10,000 vans",
+    }])
+
+    assert index.contains("https://example.com/2026/10/11/weekly", "Weekly round-up")
+    # 同名栏目的新一期
+    assert not index.contains("https://example.com/2026/10/18/weekly", "Weekly round-up",
+                              "Renault unveils the new Twingo")
+    # 换了URL的同一篇文章
+    assert index.contains("https://example.com/amp/weekly", "Weekly Round-Up!",
+                          "Stellantis recalls 10,000 vans")
+    index.close()
+
+
+
+def test_purge_expired(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.sqlite3"))
+    index.add_many([{"link": "https://example.com/a", "title": "A", "summary": "a"}])
+    assert len(index) == 2
+    index.ttl_seconds = -60
+    assert index.purge_expired() == 2
+    assert not index.contains("https://example.com/a", "A", "a")
+    index.close()
@@ -0,0 +1,66 @@
+"""候选新闻筛选 (fetcher.NewsSelector) 的测试"""
+
+from datetime import datetime, timedelta, timezone
+
+from fetcher import NewsSelector
+
+NOW = datetime(2026, 10, 18, 7, 0, tzinfo=timezone.utc)
+
+RECALL = "Volkswagen recalls 120,000 electric ID.4 cars in Germany over battery fault"
+RECALL_SUMMARY = "The recall affects ID.4 models built between 2023 and 2025 with a faulty battery module."
+
+
+def _news(title, summary, source, link, hours_ago=1):
+    return {
+        "title": title,
+        "summary": summary,
+        "source": source,
+        "link": link,
+        "published": NOW - timedelta(hours=hours_ago),
+    }
+
+
+def test_excluded_first_copy_does_not_drop_the_story():
+    news = [
+        # 第一篇转载带有排除关键词
+        _news(RECALL, RECALL_SUMMARY + " Our review follows.", "Autocar", "https://a.example/recall"),
+        _news(RECALL, RECALL_SUMMARY, "Just Auto", "https://b.example/recall"),
+        _news(RECALL, RECALL_SUMMARY, "GCR", "https://c.example/recall"),
+    ]
+    selected = NewsSelector(now=NOW).select(news, 10)
+
+    assert [n["link"] for n in selected] == ["https://b.example/recall"]
+    assert selected[0]["other_sources"] == ["GCR"]
+    assert selected[0]["keyword_hits"]
+
+
+def test_select_dedups_and_keeps_top_k():
+    news = [
+        _news(f"BMW launches electric model {i} for Europe", f"Model {i} details differ {i * 7}",
+              "Autocar", f"https://a.example/{i}", hours_ago=i)
+        for i in range(6)
+    ]
+    news.append(dict(news[0]))
+    news.append(_news("Formula E racing returns to Germany", "Berlin race preview", "Autocar", "https://a.example/f1"))
+    selector = NewsSelector(now=NOW)
+    selected = selector.select(news, 3)
+
+    assert len(selected) == 3
+    assert "https://a.example/f1" not in {n["link"] for n in selected}
+    assert selector.metrics.dropped["dedup"] == 1
+    assert selector.metrics.dropped["exclude"] == 1
+
+
+def test_predicates_apply_before_top_k():
+    news = [
+        _news(f"BMW launches electric model {i} for Europe", f"Model {i} details differ {i * 7}",
+              "Autocar", f"https://a.example/{i}", hours_ago=i)
+        for i in range(6)
+    ]
+    # 较旧但命中突发关键词的新闻
+    news.append(_news(RECALL, RECALL_SUMMARY, "Just Auto", "https://b.example/recall", hours_ago=20))
+    selector = NewsSelector(now=NOW)
+    selected = selector.select(news, 3, predicates={"keyword": lambda n: "recall" in n["title"].lower()})
+
+    assert [n["link"] for n in selected] == ["https://b.example/recall"]
+    assert selector.metrics.dropped["keyword"] == 6
@@ -0,0 +1,76 @@
+"""自适应轮询计划 (source_scheduler.py) 的测试"""
+
+import time
+from email.utils import formatdate
+
+from source_scheduler import SourceScheduler, parse_retry_after
+
+URL = "https://example.com/feed"
+CONFIG = {
+    "default_interval": 900,
+    "min_interval": 300,
+    "max_interval": 6 * 3600,
+    "rate_factor": 0.5,
+    "backoff_base": 300,
+    "max_backoff": 3 * 3600,
+    "breaker_threshold": 3,
+    "breaker_cooldown": 12 * 3600,
+}
+NOW = 1_800_000_000.0
+
+
+def _scheduler(tmp_path):
+    return SourceScheduler(str(tmp_path / "schedule.json"), CONFIG)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 3500 < parse_retry_after(formatdate(time.time() + 3600, usegmt=True)) <= 3600
+
+
+def test_interval_learned_from_entries(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    # 每2小时一条
+    timestamps = [NOW - i * 7200 for i in range(8)]
+    scheduler.record_success(URL, timestamps=timestamps, now=NOW)
+
+    assert scheduler.poll_status(URL, now=NOW + 3599) == "not_due"
+    assert scheduler.poll_status(URL, now=NOW + 3600) == "due"
+
+
+def test_hint_and_not_modified_stretch_interval(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    scheduler.record_success(URL, timestamps=[NOW - i * 60 for i in range(8)], hint=1800, now=NOW)
+    assert scheduler.poll_status(URL, now=NOW + 1799) == "not_due"
+
+    scheduler.record_success(URL, not_modified=True, now=NOW)
+    assert scheduler.poll_status(URL, now=NOW + 2699) == "not_due"
+    assert scheduler.poll_status(URL, now=NOW + 2700) == "due"
+
+
+def test_retry_after_extends_backoff(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    scheduler.record_failure(URL, retry_after=7200, now=NOW)
+
+    assert scheduler.poll_status(URL, now=NOW + 7199) == "backoff"
+    assert scheduler.poll_status(URL, now=NOW + 7200) == "due"
+
+
+def test_breaker_opens_and_closes(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    for _ in range(3):
+        scheduler.record_failure(URL, now=NOW)
+    assert scheduler.poll_status(URL, now=NOW + 11 * 3600) == "circuit_open"
+
+    scheduler.record_success(URL, now=NOW + 12 * 3600)
+    assert scheduler.poll_status(URL, now=NOW + 12 * 3600 + 900) == "due"
+
+
+def test_state_persists(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    scheduler.record_failure(URL, retry_after=7200, now=NOW)
+    scheduler.save()
+
+    assert _scheduler(tmp_path).poll_status(URL, now=NOW + 3600) == "backoff"